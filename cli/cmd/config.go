@@ -28,7 +28,7 @@ var configViewCmd = &cobra.Command{
 			display.PrintWarning(fmt.Sprintf("Using default config due to error: %v", err))
 		}
 
-		fmt.Printf("📋 Current Configuration:\n")
+		fmt.Printf("%sCurrent Configuration:\n", display.Icon("list"))
 		fmt.Printf("  API URL: %s\n", cfg.APIURL)
 		return nil
 	},
@@ -21,9 +21,9 @@ var healthCmd = &cobra.Command{
 		}
 
 		display.PrintSuccess("API is healthy")
-		fmt.Printf("🏥 Status: %s\n", health.Status)
-		fmt.Printf("🕐 Timestamp: %s\n", health.Timestamp)
-		fmt.Printf("🤖 Agent Status: %s\n", health.AgentStatus)
+		fmt.Printf("%sStatus: %s\n", display.Icon("health"), health.Status)
+		fmt.Printf("%sTimestamp: %s\n", display.Icon("time"), health.Timestamp)
+		fmt.Printf("%sAgent Status: %s\n", display.Icon("agent"), health.AgentStatus)
 		return nil
 	},
 }
@@ -1,9 +1,13 @@
 package cmd
 
 import (
+	"errors"
 	"fmt"
+	"net"
+	"net/http"
 	"time"
 
+	"custom-cicd-cli/internal/client"
 	"custom-cicd-cli/internal/display"
 
 	"github.com/spf13/cobra"
@@ -14,7 +18,8 @@ var monitorCmd = &cobra.Command{
 	Use:   "monitor <pipeline-id-or-run-id>",
 	Short: "Monitor a pipeline or run in real-time",
 	Long: `Monitor a pipeline or run's progress in real-time.
-Updates every 2 seconds by default. Press Ctrl+C to stop monitoring.
+Updates every 2 seconds by default, polling only the status until the
+pipeline finishes and backing off while nothing changes. Press Ctrl+C to stop monitoring.
 
 The command will automatically detect if the provided ID is a pipeline or run ID.
 
@@ -29,48 +34,164 @@ Example:
 
 		display.PrintInfo(fmt.Sprintf("Monitoring %s (Ctrl+C to stop)", id))
 
+		useStatusEndpoint := true
+		isRun := false
+		pollInterval := time.Duration(interval) * time.Second
+		wait := pollInterval
 		for {
-			// Try to get as pipeline first
-			pipeline, pipelineErr := apiClient.GetPipeline(id)
-			if pipelineErr == nil {
-				// Clear screen and show pipeline status
-				fmt.Print("\033[2J\033[H")
-				display.PrintPipelineDetails(pipeline)
-
-				if pipeline.Status == "success" || pipeline.Status == "failed" || pipeline.Status == "cancelled" {
-					fmt.Printf("\n🏁 Pipeline finished with status: %s\n", pipeline.Status)
-					break
+			tickStart := time.Now()
+			changed, finished := false, false
+
+			// Try to get as pipeline first, until the ID turns out to be a run
+			var pipelineErr error
+			if !isRun {
+				var pipeline *client.Pipeline
+				pipeline, changed, pipelineErr = pollPipelineStatus(id, &useStatusEndpoint)
+				if pipelineErr == nil && changed {
+					finished = showPipeline(pipeline, useStatusEndpoint)
 				}
-			} else {
-				// Try to get as run
-				run, runErr := apiClient.GetRun(id)
-				if runErr == nil {
-					// Clear screen and show run status
-					fmt.Print("\033[2J\033[H")
-					display.PrintRunDetails(run)
-
-					if run.Status == "success" || run.Status == "failed" || run.Status == "cancelled" {
-						fmt.Printf("\n🏁 Run finished with status: %s\n", run.Status)
-						break
+			}
+			if !isRun && pipelineErr != nil && isTransient(pipelineErr) {
+				display.PrintWarning(fmt.Sprintf("Poll failed, retrying: %v", pipelineErr))
+			} else if isRun || pipelineErr != nil {
+				run, runChanged, runErr := apiClient.PollRun(id)
+				if runErr != nil && isRun && isTransient(runErr) {
+					display.PrintWarning(fmt.Sprintf("Poll failed, retrying: %v", runErr))
+				} else if runErr != nil {
+					if isRun {
+						display.PrintError(fmt.Sprintf("Failed to get run status: %v", runErr))
+						return runErr
 					}
-				} else {
 					display.PrintError(fmt.Sprintf("ID %s not found as pipeline or run", id))
 					display.PrintError(fmt.Sprintf("Pipeline error: %v", pipelineErr))
 					display.PrintError(fmt.Sprintf("Run error: %v", runErr))
 					return fmt.Errorf("invalid ID: %s", id)
+				} else {
+					isRun = true
+					changed = runChanged
+					if changed {
+						finished = showRun(run)
+					}
 				}
 			}
 
-			time.Sleep(time.Duration(interval) * time.Second)
+			if finished {
+				break
+			}
+
+			wait = nextPollInterval(wait, pollInterval, changed)
+			time.Sleep(time.Until(tickStart.Add(wait)))
 		}
 
 		return nil
 	},
 }
 
+// isFinished reports whether a pipeline or run status is final
+func isFinished(status string) bool {
+	return status == "success" || status == "failed" || status == "cancelled"
+}
+
+// maxPollInterval caps how far monitoring backs off while nothing changes
+const maxPollInterval = 30 * time.Second
+
+// nextPollInterval resets to the configured interval after a change and grows by half
+// after each poll that found nothing new
+func nextPollInterval(current, base time.Duration, changed bool) time.Duration {
+	if changed {
+		return base
+	}
+	next := current * 3 / 2
+	if next > maxPollInterval {
+		next = maxPollInterval
+	}
+	if next < base {
+		return base
+	}
+	return next
+}
+
+// pollPipelineStatus polls a pipeline's status fields (changed is false when they are the
+// same as last time), falling back to the full pipeline, and staying there, when the
+// backend has no status endpoint; other errors are returned so the next poll tries again
+func pollPipelineStatus(pipelineID string, useStatusEndpoint *bool) (*client.Pipeline, bool, error) {
+	if *useStatusEndpoint {
+		pipeline, changed, err := apiClient.PollPipelineStatus(pipelineID)
+		if !isMissingEndpoint(err) {
+			return pipeline, changed, err
+		}
+		*useStatusEndpoint = false
+	}
+	pipeline, err := apiClient.GetPipeline(pipelineID)
+	return pipeline, true, err
+}
+
+// isMissingEndpoint reports whether a request failed because the backend does not serve
+// that path or method
+func isMissingEndpoint(err error) bool {
+	var apiErr *client.APIError
+	if !errors.As(err, &apiErr) {
+		return false
+	}
+	return apiErr.StatusCode == http.StatusNotFound || apiErr.StatusCode == http.StatusMethodNotAllowed
+}
+
+// isTransient reports whether a poll failed for a reason that may go away, a network error
+// or a 5xx, rather than because the backend answered e.g. "Pipeline not found"
+func isTransient(err error) bool {
+	var apiErr *client.APIError
+	if errors.As(err, &apiErr) {
+		return apiErr.StatusCode >= 500
+	}
+	var netErr net.Error
+	return errors.As(err, &netErr)
+}
+
+// showPipeline redraws the screen with a pipeline's status and reports whether it has finished
+func showPipeline(pipeline *client.Pipeline, fromStatusEndpoint bool) bool {
+	finished := isFinished(pipeline.Status)
+	if finished {
+		pipeline = finalPipelineDetails(pipeline, fromStatusEndpoint)
+	}
+
+	// Clear screen and show pipeline status
+	fmt.Print("\033[2J\033[H")
+	display.PrintPipelineDetails(pipeline)
+
+	if finished {
+		fmt.Printf("\n%sPipeline finished with status: %s\n", display.Icon("finished"), pipeline.Status)
+	}
+	return finished
+}
+
+// showRun redraws the screen with a run's status and reports whether it has finished
+func showRun(run *client.Run) bool {
+	// Clear screen and show run status
+	fmt.Print("\033[2J\033[H")
+	display.PrintRunDetails(run)
+
+	finished := isFinished(run.Status)
+	if finished {
+		fmt.Printf("\n%sRun finished with status: %s\n", display.Icon("finished"), run.Status)
+	}
+	return finished
+}
+
+// finalPipelineDetails fetches the full pipeline, with steps, once it has finished
+func finalPipelineDetails(pipeline *client.Pipeline, fromStatusEndpoint bool) *client.Pipeline {
+	if !fromStatusEndpoint {
+		return pipeline
+	}
+	full, err := apiClient.GetPipeline(pipeline.ID)
+	if err != nil {
+		return pipeline
+	}
+	return full
+}
+
 func init() {
 	rootCmd.AddCommand(monitorCmd)
 
 	// Add flags
-	monitorCmd.Flags().Int("interval", 2, "Refresh interval in seconds")
+	monitorCmd.Flags().Int("interval", 2, "Refresh interval in seconds (backs off up to 30s while nothing changes)")
 } 
@@ -5,6 +5,7 @@ import (
 	"fmt"
 	"io"
 	"os"
+	"sync"
 	"time"
 
 	"custom-cicd-cli/internal/client"
@@ -39,20 +40,20 @@ Example:
 			filename = args[0]
 		}
 
-		pipeline, err := loadPipelineFromFile(filename)
+		config, err := loadPipelineFromFile(filename)
 		if err != nil {
 			display.PrintError(fmt.Sprintf("Failed to load pipeline: %v", err))
 			return err
 		}
 
-		response, err := apiClient.CreatePipeline(pipeline)
+		response, err := apiClient.CreatePipeline(config)
 		if err != nil {
 			display.PrintError(fmt.Sprintf("Failed to create pipeline: %v", err))
 			return err
 		}
 
 		display.PrintSuccess("Pipeline created successfully!")
-		fmt.Printf("📋 Pipeline ID: %s\n", response.PipelineID)
+		fmt.Printf("%sPipeline ID: %s\n", display.Icon("list"), response.PipelineID)
 		return nil
 	},
 }
@@ -61,15 +62,33 @@ Example:
 var pipelineListCmd = &cobra.Command{
 	Use:   "list",
 	Short: "List all pipelines",
-	Long:  `List all pipelines with their status and basic information.`,
+	Long: `List all pipelines with their status and basic information.
+With --detail, show every pipeline's latest run and steps as well.`,
 	RunE: func(cmd *cobra.Command, args []string) error {
+		detail, _ := cmd.Flags().GetBool("detail")
+
 		pipelines, err := apiClient.ListPipelines()
 		if err != nil {
 			display.PrintError(fmt.Sprintf("Failed to list pipelines: %v", err))
 			return err
 		}
 
-		display.PrintPipelines(pipelines)
+		if !detail || len(pipelines) == 0 {
+			display.PrintPipelines(pipelines)
+			return nil
+		}
+
+		ids := make([]string, len(pipelines))
+		for i, pipeline := range pipelines {
+			ids[i] = pipeline.ID
+		}
+
+		for _, pipeline := range getPipelineDetails(ids) {
+			// Deleted between the two requests, or could not be fetched
+			if pipeline != nil {
+				display.PrintPipelineDetails(pipeline)
+			}
+		}
 		return nil
 	},
 }
@@ -111,7 +130,7 @@ var pipelineRunCmd = &cobra.Command{
 		}
 
 		display.PrintSuccess("Pipeline started successfully!")
-		fmt.Printf("🚀 Run ID: %s\n", response.RunID)
+		fmt.Printf("%sRun ID: %s\n", display.Icon("run"), response.RunID)
 		return nil
 	},
 }
@@ -175,21 +194,21 @@ Example:
 			filename = args[0]
 		}
 
-		pipeline, err := loadPipelineFromFile(filename)
+		config, err := loadPipelineFromFile(filename)
 		if err != nil {
 			display.PrintError(fmt.Sprintf("Failed to load pipeline: %v", err))
 			return err
 		}
 
-		response, err := apiClient.CreateAndRunPipeline(pipeline)
+		response, err := apiClient.CreateAndRunPipeline(config)
 		if err != nil {
 			display.PrintError(fmt.Sprintf("Failed to create and run pipeline: %v", err))
 			return err
 		}
 
 		display.PrintSuccess("Pipeline created and started successfully!")
-		fmt.Printf("📋 Pipeline ID: %s\n", response.PipelineID)
-		fmt.Printf("🚀 Run ID: %s\n", response.RunID)
+		fmt.Printf("%sPipeline ID: %s\n", display.Icon("list"), response.PipelineID)
+		fmt.Printf("%sRun ID: %s\n", display.Icon("run"), response.RunID)
 		return nil
 	},
 }
@@ -206,52 +225,90 @@ var pipelineMonitorCmd = &cobra.Command{
 
 		display.PrintInfo(fmt.Sprintf("Monitoring pipeline %s (Ctrl+C to stop)", pipelineID))
 
+		useStatusEndpoint := true
+		pollInterval := time.Duration(interval) * time.Second
+		wait := pollInterval
 		for {
-			pipeline, err := apiClient.GetPipeline(pipelineID)
-			if err != nil {
+			tickStart := time.Now()
+			pipeline, changed, err := pollPipelineStatus(pipelineID, &useStatusEndpoint)
+			if err != nil && isTransient(err) {
+				display.PrintWarning(fmt.Sprintf("Poll failed, retrying: %v", err))
+			} else if err != nil {
 				display.PrintError(fmt.Sprintf("Failed to get pipeline status: %v", err))
 				return err
-			}
-
-			// Clear screen and show status
-			fmt.Print("\033[2J\033[H")
-			display.PrintPipelineDetails(pipeline)
-
-			if pipeline.Status == "success" || pipeline.Status == "failed" || pipeline.Status == "cancelled" {
-				fmt.Printf("\n🏁 Pipeline finished with status: %s\n", pipeline.Status)
+			} else if changed && showPipeline(pipeline, useStatusEndpoint) {
 				break
 			}
 
-			time.Sleep(time.Duration(interval) * time.Second)
+			wait = nextPollInterval(wait, pollInterval, changed)
+			time.Sleep(time.Until(tickStart.Add(wait)))
 		}
 
 		return nil
 	},
 }
 
-// loadPipelineFromFile loads a pipeline configuration from a file or stdin
-func loadPipelineFromFile(filename string) (*client.Pipeline, error) {
-	var reader io.Reader
+// getPipelineDetails gets the details of several pipelines with one batch request, in the
+// order of ids with nil for any that no longer exist
+func getPipelineDetails(ids []string) []*client.Pipeline {
+	details, err := apiClient.GetPipelines(ids)
+	if err != nil {
+		// Backends without the batch endpoint: one request per pipeline, several at a time
+		return getPipelinesConcurrently(ids)
+	}
+	return details
+}
+
+// detailWorkers is how many pipeline requests getPipelinesConcurrently keeps in flight
+const detailWorkers = 8
+
+// getPipelinesConcurrently gets pipeline details with one request each, overlapping up to
+// detailWorkers of them; the result follows the order of ids, with nil where a request failed
+func getPipelinesConcurrently(ids []string) []*client.Pipeline {
+	details := make([]*client.Pipeline, len(ids))
+	slots := make(chan struct{}, detailWorkers)
+	var wg sync.WaitGroup
+
+	for i, id := range ids {
+		wg.Add(1)
+		slots <- struct{}{}
+		go func(i int, id string) {
+			defer wg.Done()
+			defer func() { <-slots }()
+			if pipeline, err := apiClient.GetPipeline(id); err == nil {
+				details[i] = pipeline
+			}
+		}(i, id)
+	}
+
+	wg.Wait()
+	return details
+}
+
+// loadPipelineFromFile reads a pipeline configuration from a file or stdin. The JSON is only
+// checked, not decoded: it is sent as read, so every field reaches the backend unchanged
+func loadPipelineFromFile(filename string) (json.RawMessage, error) {
+	var data []byte
+	var err error
 
 	if filename == "-" {
 		display.PrintInfo("Reading pipeline configuration from stdin...")
-		reader = os.Stdin
+		data, err = io.ReadAll(os.Stdin)
+		if err != nil {
+			return nil, fmt.Errorf("failed to read stdin: %w", err)
+		}
 	} else {
-		file, err := os.Open(filename)
+		data, err = os.ReadFile(filename)
 		if err != nil {
 			return nil, fmt.Errorf("failed to open file %s: %w", filename, err)
 		}
-		defer file.Close()
-		reader = file
 	}
 
-	var pipeline client.Pipeline
-	decoder := json.NewDecoder(reader)
-	if err := decoder.Decode(&pipeline); err != nil {
-		return nil, fmt.Errorf("failed to decode pipeline JSON: %w", err)
+	if !json.Valid(data) {
+		return nil, fmt.Errorf("failed to decode pipeline JSON: invalid JSON")
 	}
 
-	return &pipeline, nil
+	return json.RawMessage(data), nil
 }
 
 func init() {
@@ -268,6 +325,7 @@ func init() {
 	pipelineCmd.AddCommand(pipelineMonitorCmd)
 
 	// Add flags
+	pipelineListCmd.Flags().Bool("detail", false, "Show each pipeline's latest run and steps")
 	pipelineRunCmd.Flags().Bool("background", true, "Run pipeline in background")
-	pipelineMonitorCmd.Flags().Int("interval", 2, "Refresh interval in seconds")
+	pipelineMonitorCmd.Flags().Int("interval", 2, "Refresh interval in seconds (backs off up to 30s while nothing changes)")
 } 
@@ -0,0 +1,74 @@
+package cmd
+
+import (
+	"net/http"
+	"net/http/httptest"
+	"strings"
+	"sync/atomic"
+	"testing"
+
+	"custom-cicd-cli/internal/client"
+)
+
+// detailServer serves pipelines p-1 and p-2 one at a time, and the batch endpoint only
+// when withBatch is set
+func detailServer(t *testing.T, withBatch bool) (*httptest.Server, *int32) {
+	var singleGets int32
+	server := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		switch {
+		case r.URL.Path == "/api/pipelines/batch" && withBatch:
+			w.Write([]byte(`{"success":true,"data":[{"id":"p-2","name":"deploy"},null,{"id":"p-1","name":"build"}]}`))
+		case r.Method != http.MethodGet:
+			// An older backend takes "batch" for a pipeline ID, which only allows GET
+			w.WriteHeader(http.StatusMethodNotAllowed)
+		case r.URL.Path == "/api/pipelines/p-1":
+			atomic.AddInt32(&singleGets, 1)
+			w.Write([]byte(`{"success":true,"data":{"id":"p-1","name":"build"}}`))
+		case r.URL.Path == "/api/pipelines/p-2":
+			atomic.AddInt32(&singleGets, 1)
+			w.Write([]byte(`{"success":true,"data":{"id":"p-2","name":"deploy"}}`))
+		case strings.HasPrefix(r.URL.Path, "/api/pipelines/"):
+			atomic.AddInt32(&singleGets, 1)
+			w.Write([]byte(`{"success":false,"error":"Pipeline not found"}`))
+		default:
+			http.NotFound(w, r)
+		}
+	}))
+	t.Cleanup(server.Close)
+	apiClient = client.NewClient(server.URL)
+	return server, &singleGets
+}
+
+func pipelineNames(details []*client.Pipeline) []string {
+	names := make([]string, len(details))
+	for i, pipeline := range details {
+		if pipeline != nil {
+			names[i] = pipeline.Name
+		}
+	}
+	return names
+}
+
+func TestGetPipelineDetailsUsesBatch(t *testing.T) {
+	_, singleGets := detailServer(t, true)
+
+	names := pipelineNames(getPipelineDetails([]string{"p-2", "missing", "p-1"}))
+	if strings.Join(names, ",") != "deploy,,build" {
+		t.Fatalf("got %q", names)
+	}
+	if *singleGets != 0 {
+		t.Fatalf("made %d single requests despite the batch endpoint", *singleGets)
+	}
+}
+
+func TestGetPipelineDetailsFallsBackWithoutBatch(t *testing.T) {
+	_, singleGets := detailServer(t, false)
+
+	names := pipelineNames(getPipelineDetails([]string{"p-2", "missing", "p-1"}))
+	if strings.Join(names, ",") != "deploy,,build" {
+		t.Fatalf("got %q", names)
+	}
+	if *singleGets != 3 {
+		t.Fatalf("made %d single requests, want 3", *singleGets)
+	}
+}
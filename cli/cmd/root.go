@@ -1,7 +1,9 @@
 package cmd
 
 import (
+	"errors"
 	"fmt"
+	"net/url"
 
 	"custom-cicd-cli/internal/client"
 	"custom-cicd-cli/internal/config"
@@ -32,6 +34,11 @@ Example usage:
   cicd run list
   cicd monitor <pipeline-id>`,
 	PersistentPreRunE: func(cmd *cobra.Command, args []string) error {
+		// Commands that never talk to the API skip loading the config and building the client
+		if !usesAPI(cmd) {
+			return nil
+		}
+
 		var err error
 
 		// Load configuration
@@ -46,23 +53,47 @@ Example usage:
 			cfg.APIURL = apiURL
 		}
 
-		// Create API client
+		// Create API client. There is no up-front health probe: it cost every command an extra
+		// round trip, and a down backend shows up on the command's own request anyway
 		apiClient = client.NewClient(cfg.APIURL)
 
-		// Test connection (but don't fail if it's not available)
-		if _, err := apiClient.HealthCheck(); err != nil {
-			display.PrintWarning(fmt.Sprintf("Could not connect to API at %s: %v", cfg.APIURL, err))
-			display.PrintInfo("Make sure the CI/CD backend is running")
-		}
-
 		return nil
 	},
 }
 
+// localCommands are the top-level commands that work without the API (config loads its own settings)
+var localCommands = map[string]bool{
+	"config":     true,
+	"version":    true,
+	"help":       true,
+	"completion": true,
+}
+
+// usesAPI reports whether cmd needs the API client, judging by its top-level command
+func usesAPI(cmd *cobra.Command) bool {
+	// The root command alone only prints help
+	if !cmd.HasParent() {
+		return false
+	}
+	for cmd.Parent().HasParent() {
+		cmd = cmd.Parent()
+	}
+	return !localCommands[cmd.Name()]
+}
+
 // Execute adds all child commands to the root command and sets flags appropriately.
 // This is called by main.main(). It only needs to happen once to the rootCmd.
 func Execute() error {
-	return rootCmd.Execute()
+	err := rootCmd.Execute()
+
+	// The request never got an HTTP response: most likely the backend is not reachable
+	var urlErr *url.Error
+	if errors.As(err, &urlErr) && cfg != nil {
+		display.PrintWarning(fmt.Sprintf("Could not connect to API at %s", cfg.APIURL))
+		display.PrintInfo("Make sure the CI/CD backend is running")
+	}
+
+	return err
 }
 
 func init() {
@@ -2,11 +2,16 @@ package client
 
 import (
 	"bytes"
+	"crypto/sha256"
 	"encoding/json"
 	"fmt"
 	"io"
+	"net"
 	"net/http"
 	"net/url"
+	"strconv"
+	"strings"
+	"sync"
 	"time"
 )
 
@@ -14,18 +19,68 @@ import (
 type Client struct {
 	BaseURL    string
 	HTTPClient *http.Client
+
+	// What the last conditional GET per endpoint returned
+	polls  map[string]pollState
+	pollMu sync.Mutex
+}
+
+// pollState identifies the response of a conditional GET: the backend's ETag covers all of
+// its state, so the body hash is what tells whether this one resource changed
+type pollState struct {
+	etag string
+	sum  [sha256.Size]byte
+}
+
+// maxRetries is how many times an idempotent request is retried when the gateway reports the backend unavailable
+const maxRetries = 2
+
+// retryBackoff is the delay before the first retry; it doubles on each further attempt
+const retryBackoff = 200 * time.Millisecond
+
+// connectTimeout bounds establishing a connection, separately from the 30s for a whole request
+const connectTimeout = 3 * time.Second
+
+// pipelinePath is the API path of one pipeline, plus an optional suffix such as "/cancel"
+func pipelinePath(pipelineID, suffix string) string {
+	return "/api/pipelines/" + url.PathEscape(pipelineID) + suffix
+}
+
+// runPath is the API path of one run, plus an optional suffix such as "/cancel"
+func runPath(runID, suffix string) string {
+	return "/api/runs/" + url.PathEscape(runID) + suffix
 }
 
 // NewClient creates a new API client
 func NewClient(baseURL string) *Client {
+	// A dedicated pool of keep-alive connections, so repeated calls (e.g. monitor polling)
+	// reuse one connection instead of a new TCP/TLS handshake per request
+	transport := http.DefaultTransport.(*http.Transport).Clone()
+	// A backend that is down fails in seconds rather than after the whole request timeout
+	transport.DialContext = (&net.Dialer{
+		Timeout:   connectTimeout,
+		KeepAlive: 30 * time.Second,
+	}).DialContext
+	transport.MaxIdleConns = 16
+	transport.MaxIdleConnsPerHost = 16
+	transport.IdleConnTimeout = 90 * time.Second
+
 	return &Client{
-		BaseURL: baseURL,
+		// Endpoints start with a slash; a configured trailing one would double it on every request
+		BaseURL: strings.TrimRight(baseURL, "/"),
 		HTTPClient: &http.Client{
-			Timeout: 30 * time.Second,
+			Timeout:   30 * time.Second,
+			Transport: transport,
 		},
+		polls: make(map[string]pollState),
 	}
 }
 
+// isRetryableStatus reports whether a response means the backend was briefly unavailable
+func isRetryableStatus(code int) bool {
+	return code == http.StatusBadGateway || code == http.StatusServiceUnavailable || code == http.StatusGatewayTimeout
+}
+
 // Pipeline represents a pipeline configuration
 type Pipeline struct {
 	ID         string   `json:"id,omitempty"`
@@ -91,52 +146,172 @@ type ErrorResponse struct {
 	Error string `json:"error"`
 }
 
+// APIError is returned when the backend answered with an error, so callers can tell e.g. a
+// missing endpoint (404) from a failing backend; StatusCode is 200 when only the response's
+// success:false envelope reported it, as the backend does for unknown IDs
+type APIError struct {
+	StatusCode int
+	Message    string
+}
+
+func (e *APIError) Error() string {
+	return e.Message
+}
+
 // APIResponse represents the wrapped response from the backend
 type APIResponse struct {
-	Data    interface{} `json:"data"`
-	Success bool        `json:"success"`
-	Error   string      `json:"error,omitempty"`
+	Data    json.RawMessage `json:"data"`
+	Success bool            `json:"success"`
+	Error   string          `json:"error,omitempty"`
 }
 
 // doRequest performs an HTTP request and handles the response
 func (c *Client) doRequest(method, endpoint string, body interface{}, response interface{}) error {
+	resp, respBody, err := c.send(method, endpoint, body, "")
+	if err != nil {
+		return err
+	}
+	return decodeResponse(resp, respBody, response)
+}
+
+// getIfChanged performs a conditional GET; it returns false, leaving response untouched,
+// when the resource is the same as on the previous call for the same endpoint
+func (c *Client) getIfChanged(endpoint string, response interface{}) (bool, error) {
+	c.pollMu.Lock()
+	last, polled := c.polls[endpoint]
+	c.pollMu.Unlock()
+
+	resp, respBody, err := c.send(http.MethodGet, endpoint, nil, last.etag)
+	if err != nil {
+		return false, err
+	}
+	if resp.StatusCode == http.StatusNotModified {
+		return false, nil
+	}
+
+	// Any change anywhere in the backend's state gives a new ETag; only a different body
+	// means this resource changed
+	current := pollState{etag: resp.Header.Get("ETag"), sum: sha256.Sum256(respBody)}
+	changed := !polled || current.sum != last.sum || resp.StatusCode >= 400
+	if changed {
+		if err := decodeResponse(resp, respBody, response); err != nil {
+			return false, err
+		}
+	}
+
+	c.pollMu.Lock()
+	c.polls[endpoint] = current
+	c.pollMu.Unlock()
+	return changed, nil
+}
+
+// send performs an HTTP request and reads the whole response body
+func (c *Client) send(method, endpoint string, body interface{}, etag string) (*http.Response, []byte, error) {
+	resp, err := c.do(method, endpoint, body, etag)
+	if err != nil {
+		return nil, nil, err
+	}
+	defer resp.Body.Close()
+
+	// Reading the body to the end lets the connection go back to the pool
+	respBody, err := io.ReadAll(resp.Body)
+	if err != nil {
+		return nil, nil, fmt.Errorf("failed to read response body: %w", err)
+	}
+	return resp, respBody, nil
+}
+
+// getStream performs a GET and decodes the wrapped response straight from the connection,
+// without first buffering the whole body; meant for list endpoints that can grow large
+func (c *Client) getStream(endpoint string, response interface{}) error {
+	resp, err := c.do(http.MethodGet, endpoint, nil, "")
+	if err != nil {
+		return err
+	}
+	defer resp.Body.Close()
+
+	if resp.StatusCode >= 400 {
+		respBody, err := io.ReadAll(resp.Body)
+		if err != nil {
+			return fmt.Errorf("failed to read response body: %w", err)
+		}
+		return decodeResponse(resp, respBody, nil)
+	}
+
+	// Data holds a pointer to the target, so the decoder fills it in directly
+	envelope := struct {
+		Data    interface{} `json:"data"`
+		Success bool        `json:"success"`
+		Error   string      `json:"error,omitempty"`
+	}{Data: response}
+	if err := json.NewDecoder(resp.Body).Decode(&envelope); err != nil {
+		return fmt.Errorf("failed to unmarshal response: %w", err)
+	}
+	// Drain anything after the JSON value, so the connection can be reused
+	io.Copy(io.Discard, resp.Body)
+
+	if !envelope.Success {
+		return &APIError{StatusCode: resp.StatusCode, Message: "API error: " + envelope.Error}
+	}
+	return nil
+}
+
+// do performs an HTTP request, retrying GETs the gateway reports as unavailable, and returns
+// the final response with its body unread
+func (c *Client) do(method, endpoint string, body interface{}, etag string) (*http.Response, error) {
 	url := c.BaseURL + endpoint
 
 	var reqBody io.Reader
-	if body != nil {
+	if raw, ok := body.(json.RawMessage); ok {
+		// Already encoded, e.g. a pipeline file sent as it was read
+		reqBody = bytes.NewReader(raw)
+	} else if body != nil {
 		jsonData, err := json.Marshal(body)
 		if err != nil {
-			return fmt.Errorf("failed to marshal request body: %w", err)
+			return nil, fmt.Errorf("failed to marshal request body: %w", err)
 		}
 		reqBody = bytes.NewBuffer(jsonData)
 	}
 
 	req, err := http.NewRequest(method, url, reqBody)
 	if err != nil {
-		return fmt.Errorf("failed to create request: %w", err)
+		return nil, fmt.Errorf("failed to create request: %w", err)
 	}
 
+	req.Header.Set("Accept", "application/json")
 	if body != nil {
 		req.Header.Set("Content-Type", "application/json")
 	}
-
-	resp, err := c.HTTPClient.Do(req)
-	if err != nil {
-		return fmt.Errorf("request failed: %w", err)
+	if etag != "" {
+		req.Header.Set("If-None-Match", etag)
 	}
-	defer resp.Body.Close()
 
-	respBody, err := io.ReadAll(resp.Body)
-	if err != nil {
-		return fmt.Errorf("failed to read response body: %w", err)
+	for attempt := 0; ; attempt++ {
+		resp, err := c.HTTPClient.Do(req)
+		if err != nil {
+			return nil, fmt.Errorf("request failed: %w", err)
+		}
+
+		// Only GETs are retried; repeating a POST or DELETE could apply it twice
+		if method != http.MethodGet || attempt == maxRetries || !isRetryableStatus(resp.StatusCode) {
+			return resp, nil
+		}
+
+		// Drain the error body so the retry can reuse the connection
+		io.Copy(io.Discard, resp.Body)
+		resp.Body.Close()
+		time.Sleep(retryBackoff << attempt)
 	}
+}
 
+// decodeResponse turns an error status into an error and unwraps a successful body into response
+func decodeResponse(resp *http.Response, respBody []byte, response interface{}) error {
 	if resp.StatusCode >= 400 {
 		var errorResp ErrorResponse
 		if err := json.Unmarshal(respBody, &errorResp); err != nil {
-			return fmt.Errorf("HTTP %d: %s", resp.StatusCode, string(respBody))
+			return &APIError{StatusCode: resp.StatusCode, Message: fmt.Sprintf("HTTP %d: %s", resp.StatusCode, string(respBody))}
 		}
-		return fmt.Errorf("API error: %s", errorResp.Error)
+		return &APIError{StatusCode: resp.StatusCode, Message: "API error: " + errorResp.Error}
 	}
 
 	if response != nil {
@@ -144,15 +319,14 @@ func (c *Client) doRequest(method, endpoint string, body interface{}, response i
 		var apiResp APIResponse
 		if err := json.Unmarshal(respBody, &apiResp); err == nil {
 			if !apiResp.Success {
-				return fmt.Errorf("API error: %s", apiResp.Error)
-			}
-			// Marshal the data field and unmarshal into the target response
-			dataBytes, err := json.Marshal(apiResp.Data)
-			if err != nil {
-				return fmt.Errorf("failed to marshal API data: %w", err)
+				return &APIError{StatusCode: resp.StatusCode, Message: "API error: " + apiResp.Error}
 			}
-			if err := json.Unmarshal(dataBytes, response); err != nil {
-				return fmt.Errorf("failed to unmarshal API data: %w", err)
+			// The data field is kept as raw bytes, so it is decoded once, straight into the
+			// target response, instead of into generic maps that are re-encoded first
+			if len(apiResp.Data) > 0 {
+				if err := json.Unmarshal(apiResp.Data, response); err != nil {
+					return fmt.Errorf("failed to unmarshal API data: %w", err)
+				}
 			}
 		} else {
 			// Fallback to direct unmarshaling for non-wrapped responses
@@ -168,57 +342,96 @@ func (c *Client) doRequest(method, endpoint string, body interface{}, response i
 // HealthCheck checks the health of the API
 func (c *Client) HealthCheck() (*HealthResponse, error) {
 	var response HealthResponse
-	err := c.doRequest("GET", "/health", nil, &response)
+	err := c.doRequest(http.MethodGet, "/health", nil, &response)
 	return &response, err
 }
 
-// CreatePipeline creates a new pipeline
-func (c *Client) CreatePipeline(pipeline *Pipeline) (*CreatePipelineResponse, error) {
+// CreatePipeline creates a new pipeline from its JSON definition
+func (c *Client) CreatePipeline(config json.RawMessage) (*CreatePipelineResponse, error) {
 	var response CreatePipelineResponse
-	err := c.doRequest("POST", "/api/pipelines", pipeline, &response)
+	err := c.doRequest(http.MethodPost, "/api/pipelines", config, &response)
 	return &response, err
 }
 
-// CreateAndRunPipeline creates and immediately runs a pipeline
-func (c *Client) CreateAndRunPipeline(pipeline *Pipeline) (*CreateAndRunResponse, error) {
+// CreateAndRunPipeline creates and immediately runs a pipeline from its JSON definition
+func (c *Client) CreateAndRunPipeline(config json.RawMessage) (*CreateAndRunResponse, error) {
 	var response CreateAndRunResponse
-	err := c.doRequest("POST", "/api/pipelines/run", pipeline, &response)
+	err := c.doRequest(http.MethodPost, "/api/pipelines/run", config, &response)
 	return &response, err
 }
 
 // ListPipelines lists all pipelines
 func (c *Client) ListPipelines() ([]Pipeline, error) {
 	var pipelines []Pipeline
-	err := c.doRequest("GET", "/api/pipelines", nil, &pipelines)
+	err := c.getStream("/api/pipelines", &pipelines)
 	return pipelines, err
 }
 
 // GetPipeline gets a specific pipeline by ID
 func (c *Client) GetPipeline(pipelineID string) (*Pipeline, error) {
 	var pipeline Pipeline
-	endpoint := fmt.Sprintf("/api/pipelines/%s", pipelineID)
-	err := c.doRequest("GET", endpoint, nil, &pipeline)
+	endpoint := pipelinePath(pipelineID, "")
+	err := c.doRequest(http.MethodGet, endpoint, nil, &pipeline)
+	return &pipeline, err
+}
+
+// GetPipelines gets the details of several pipelines in one request; the result follows the
+// order of pipelineIDs, with nil for a pipeline that no longer exists
+func (c *Client) GetPipelines(pipelineIDs []string) ([]*Pipeline, error) {
+	var pipelines []*Pipeline
+	body := map[string][]string{"ids": pipelineIDs}
+	err := c.doRequest(http.MethodPost, "/api/pipelines/batch", body, &pipelines)
+	return pipelines, err
+}
+
+// GetPipelineStatus gets a pipeline's status fields only, without the steps of its latest run
+func (c *Client) GetPipelineStatus(pipelineID string) (*Pipeline, error) {
+	var pipeline Pipeline
+	endpoint := pipelinePath(pipelineID, "/status")
+	err := c.doRequest(http.MethodGet, endpoint, nil, &pipeline)
 	return &pipeline, err
 }
 
+// PollPipelineStatus is GetPipelineStatus as a conditional GET: changed is false, and pipeline
+// nil, when nothing changed since the previous poll of the same pipeline
+func (c *Client) PollPipelineStatus(pipelineID string) (pipeline *Pipeline, changed bool, err error) {
+	pipeline = &Pipeline{}
+	changed, err = c.getIfChanged(pipelinePath(pipelineID, "/status"), pipeline)
+	if !changed {
+		pipeline = nil
+	}
+	return pipeline, changed, err
+}
+
+// PollRun is GetRun as a conditional GET: changed is false, and run nil, when nothing
+// changed since the previous poll of the same run
+func (c *Client) PollRun(runID string) (run *Run, changed bool, err error) {
+	run = &Run{}
+	changed, err = c.getIfChanged(runPath(runID, ""), run)
+	if !changed {
+		run = nil
+	}
+	return run, changed, err
+}
+
 // RunPipeline runs an existing pipeline
 func (c *Client) RunPipeline(pipelineID string, background bool) (*RunPipelineResponse, error) {
 	var response RunPipelineResponse
-	endpoint := fmt.Sprintf("/api/pipelines/%s/run?background=%t", pipelineID, background)
-	err := c.doRequest("POST", endpoint, nil, &response)
+	endpoint := pipelinePath(pipelineID, "/run?background="+strconv.FormatBool(background))
+	err := c.doRequest(http.MethodPost, endpoint, nil, &response)
 	return &response, err
 }
 
 // CancelPipeline cancels a running pipeline
 func (c *Client) CancelPipeline(pipelineID string) error {
-	endpoint := fmt.Sprintf("/api/pipelines/%s/cancel", pipelineID)
-	return c.doRequest("POST", endpoint, nil, nil)
+	endpoint := pipelinePath(pipelineID, "/cancel")
+	return c.doRequest(http.MethodPost, endpoint, nil, nil)
 }
 
 // DeletePipeline deletes a pipeline
 func (c *Client) DeletePipeline(pipelineID string) error {
-	endpoint := fmt.Sprintf("/api/pipelines/%s", pipelineID)
-	return c.doRequest("DELETE", endpoint, nil, nil)
+	endpoint := pipelinePath(pipelineID, "")
+	return c.doRequest(http.MethodDelete, endpoint, nil, nil)
 }
 
 // ListRuns lists all runs, optionally filtered by pipeline ID
@@ -228,26 +441,26 @@ func (c *Client) ListRuns(pipelineID string) ([]Run, error) {
 	if pipelineID != "" {
 		endpoint += "?pipeline_id=" + url.QueryEscape(pipelineID)
 	}
-	err := c.doRequest("GET", endpoint, nil, &runs)
+	err := c.getStream(endpoint, &runs)
 	return runs, err
 }
 
 // GetRun gets a specific run by ID
 func (c *Client) GetRun(runID string) (*Run, error) {
 	var run Run
-	endpoint := fmt.Sprintf("/api/runs/%s", runID)
-	err := c.doRequest("GET", endpoint, nil, &run)
+	endpoint := runPath(runID, "")
+	err := c.doRequest(http.MethodGet, endpoint, nil, &run)
 	return &run, err
 }
 
 // CancelRun cancels a running pipeline run
 func (c *Client) CancelRun(runID string) error {
-	endpoint := fmt.Sprintf("/api/runs/%s/cancel", runID)
-	return c.doRequest("POST", endpoint, nil, nil)
+	endpoint := runPath(runID, "/cancel")
+	return c.doRequest(http.MethodPost, endpoint, nil, nil)
 }
 
 // DeleteRun deletes a specific run
 func (c *Client) DeleteRun(runID string) error {
-	endpoint := fmt.Sprintf("/api/runs/%s", runID)
-	return c.doRequest("DELETE", endpoint, nil, nil)
+	endpoint := runPath(runID, "")
+	return c.doRequest(http.MethodDelete, endpoint, nil, nil)
 }
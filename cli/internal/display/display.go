@@ -1,7 +1,9 @@
 package display
 
 import (
+	"bufio"
 	"fmt"
+	"os"
 	"strings"
 	"time"
 
@@ -19,168 +21,241 @@ var StatusEmojis = map[string]string{
 	"never_run": "💤",
 }
 
+// separator is the rule printed under a listing's heading
+var separator = strings.Repeat("-", 80)
+
+// Fixed lines of one listing row, written with a single Fprintf
+const (
+	pipelineRowFormat = "%s %s\n\tID: %s\n\tStatus: %s\n\tCreated: %s\n"
+	runRowFormat      = "%s %s\n   Run ID: %s\n   Pipeline ID: %s\n   Status: %s\n   Created: %s\n"
+)
+
+// statusTags are the ASCII stand-ins for StatusEmojis where emoji cannot be shown
+var statusTags = map[string]string{
+	"pending":   "[PENDING]",
+	"running":   "[RUNNING]",
+	"success":   "[OK]",
+	"failed":    "[FAIL]",
+	"cancelled": "[CANCELLED]",
+	"skipped":   "[SKIPPED]",
+	"never_run": "[NEVER RUN]",
+}
+
+// emojiIcons are the decorative prefixes of output lines, including their trailing spacing
+var emojiIcons = map[string]string{
+	"list":     "📋 ",
+	"runs":     "🏃 ",
+	"run":      "🚀 ",
+	"status":   "📊 ",
+	"time":     "🕐 ",
+	"duration": "⏱️  ",
+	"steps":    "📝 ",
+	"output":   "📤 ",
+	"error":    "🚨 ",
+	"health":   "🏥 ",
+	"agent":    "🤖 ",
+	"finished": "🏁 ",
+	"success":  "✅ ",
+	"failure":  "❌ ",
+	"info":     "ℹ️  ",
+	"warning":  "⚠️  ",
+}
+
+// asciiIcons replace emojiIcons where emoji cannot be shown; purely decorative ones are left out
+var asciiIcons = map[string]string{
+	"success": "[OK] ",
+	"failure": "[FAIL] ",
+	"info":    "[INFO] ",
+	"warning": "[WARN] ",
+}
+
+// useEmoji is decided once per process: emoji only go to a terminal whose locale is UTF-8
+var useEmoji = detectEmoji()
+
+// detectEmoji reports whether stdout is a terminal that can show emoji; redirected output
+// and non-UTF-8 locales get plain ASCII
+func detectEmoji() bool {
+	info, err := os.Stdout.Stat()
+	if err != nil || info.Mode()&os.ModeCharDevice == 0 {
+		return false
+	}
+	// The first locale variable that is set decides, as in POSIX
+	for _, name := range []string{"LC_ALL", "LC_CTYPE", "LANG"} {
+		if value := strings.ToLower(os.Getenv(name)); value != "" {
+			return strings.Contains(value, "utf-8") || strings.Contains(value, "utf8")
+		}
+	}
+	// No locale at all, e.g. a Windows console
+	return true
+}
+
+// Icon returns the prefix for a line of the given kind: its emoji, an ASCII tag, or nothing
+func Icon(name string) string {
+	if useEmoji {
+		return emojiIcons[name]
+	}
+	return asciiIcons[name]
+}
+
+// statusIcon returns the emoji or ASCII tag for a status, or a question mark for an unknown one
+func statusIcon(status string) string {
+	icons, unknown := StatusEmojis, "❓"
+	if !useEmoji {
+		icons, unknown = statusTags, "[?]"
+	}
+	if icon, ok := icons[status]; ok {
+		return icon
+	}
+	return unknown
+}
+
+// writeSteps writes the step list shared by the pipeline and run details
+func writeSteps(w *bufio.Writer, steps []client.Step) {
+	if len(steps) == 0 {
+		return
+	}
+
+	fmt.Fprintf(w, "\n%sSteps:\n", Icon("steps"))
+	for i, step := range steps {
+		fmt.Fprintf(w, "  %d. %s %s [%s]\n", i+1, statusIcon(step.Status), step.Name, step.Status)
+		if output := strings.TrimSpace(step.Output); output != "" {
+			fmt.Fprintf(w, "     %sOutput: %s\n", Icon("output"), output)
+		}
+		if stepErr := strings.TrimSpace(step.Error); stepErr != "" {
+			fmt.Fprintf(w, "     %sError: %s\n", Icon("error"), stepErr)
+		}
+	}
+}
+
+// newWriter buffers a listing on stdout so it reaches the terminal in a few large writes
+// instead of one per line
+func newWriter() *bufio.Writer {
+	return bufio.NewWriterSize(os.Stdout, 64*1024)
+}
+
 // PrintPipelines displays a list of pipelines in a formatted way
 func PrintPipelines(pipelines []client.Pipeline) {
+	w := newWriter()
+	defer w.Flush()
+
 	if len(pipelines) == 0 {
-		fmt.Println("📋 No pipelines found")
+		fmt.Fprintf(w, "%sNo pipelines found\n", Icon("list"))
 		return
 	}
 
-	fmt.Printf("\n📋 Found %d pipeline(s):\n", len(pipelines))
-	fmt.Println(strings.Repeat("-", 80))
+	fmt.Fprintf(w, "\n%sFound %d pipeline(s):\n", Icon("list"), len(pipelines))
+	fmt.Fprintln(w, separator)
 	
 	for _, pipeline := range pipelines {
-		emoji := StatusEmojis[pipeline.Status]
-		if emoji == "" {
-			emoji = "❓"
-		}
+		icon := statusIcon(pipeline.Status)
 
-		fmt.Printf("%s %s\n", emoji, pipeline.Name)
-		fmt.Printf("\tID: %s\n", pipeline.ID)
-		fmt.Printf("\tStatus: %s\n", pipeline.Status)
-		fmt.Printf("\tCreated: %s\n", pipeline.CreatedAt)
+		fmt.Fprintf(w, pipelineRowFormat, icon, pipeline.Name, pipeline.ID, pipeline.Status, pipeline.CreatedAt)
 		if pipeline.StartedAt != nil {
-			fmt.Printf("\tStarted: %s\n", *pipeline.StartedAt)
+			fmt.Fprintf(w, "\tStarted: %s\n", *pipeline.StartedAt)
 		}
 		if pipeline.FinishedAt != nil {
-			fmt.Printf("\tFinished: %s\n", *pipeline.FinishedAt)
+			fmt.Fprintf(w, "\tFinished: %s\n", *pipeline.FinishedAt)
 		}
-		fmt.Println()
+		fmt.Fprintln(w)
 	}
 }
 
 // PrintPipelineDetails displays detailed information about a pipeline
 func PrintPipelineDetails(pipeline *client.Pipeline) {
-	emoji := StatusEmojis[pipeline.Status]
-	if emoji == "" {
-		emoji = "❓"
-	}
+	w := newWriter()
+	defer w.Flush()
+
+	icon := statusIcon(pipeline.Status)
 
-	fmt.Printf("\n%s Pipeline: %s\n", emoji, pipeline.Name)
-	fmt.Printf("📋 ID: %s\n", pipeline.ID)
-	fmt.Printf("📊 Status: %s\n", pipeline.Status)
+	fmt.Fprintf(w, "\n%s Pipeline: %s\n", icon, pipeline.Name)
+	fmt.Fprintf(w, "%sID: %s\n", Icon("list"), pipeline.ID)
+	fmt.Fprintf(w, "%sStatus: %s\n", Icon("status"), pipeline.Status)
 	if pipeline.StartedAt != nil {
-		fmt.Printf("🕐 Started: %s\n", *pipeline.StartedAt)
+		fmt.Fprintf(w, "%sStarted: %s\n", Icon("time"), *pipeline.StartedAt)
 	}
 	if pipeline.FinishedAt != nil {
-		fmt.Printf("🕐 Finished: %s\n", *pipeline.FinishedAt)
+		fmt.Fprintf(w, "%sFinished: %s\n", Icon("time"), *pipeline.FinishedAt)
 	}
 	if pipeline.Duration != nil {
-		fmt.Printf("⏱️  Duration: %.2f seconds\n", *pipeline.Duration)
-	}
-
-	if len(pipeline.Steps) > 0 {
-		fmt.Println("\n📝 Steps:")
-		for i, step := range pipeline.Steps {
-			stepEmoji := StatusEmojis[step.Status]
-			if stepEmoji == "" {
-				stepEmoji = "❓"
-			}
-
-			fmt.Printf("  %d. %s %s [%s]\n", i+1, stepEmoji, step.Name, step.Status)
-			if step.Output != "" && strings.TrimSpace(step.Output) != "" {
-				fmt.Printf("     📤 Output: %s\n", strings.TrimSpace(step.Output))
-			}
-			if step.Error != "" && strings.TrimSpace(step.Error) != "" {
-				fmt.Printf("     🚨 Error: %s\n", strings.TrimSpace(step.Error))
-			}
-		}
+		fmt.Fprintf(w, "%sDuration: %.2f seconds\n", Icon("duration"), *pipeline.Duration)
 	}
+
+	writeSteps(w, pipeline.Steps)
 }
 
 // PrintRuns displays a list of runs in a formatted way
 func PrintRuns(runs []client.Run) {
+	w := newWriter()
+	defer w.Flush()
+
 	if len(runs) == 0 {
-		fmt.Println("🏃 No runs found")
+		fmt.Fprintf(w, "%sNo runs found\n", Icon("runs"))
 		return
 	}
 
-	fmt.Printf("\n🏃 Found %d run(s):\n", len(runs))
-	fmt.Println(strings.Repeat("-", 80))
+	fmt.Fprintf(w, "\n%sFound %d run(s):\n", Icon("runs"), len(runs))
+	fmt.Fprintln(w, separator)
 
 	for _, run := range runs {
-		emoji := StatusEmojis[run.Status]
-		if emoji == "" {
-			emoji = "❓"
-		}
+		icon := statusIcon(run.Status)
 
-		fmt.Printf("%s %s\n", emoji, run.Name)
-		fmt.Printf("   Run ID: %s\n", run.ID)
-		fmt.Printf("   Pipeline ID: %s\n", run.PipelineID)
-		fmt.Printf("   Status: %s\n", run.Status)
-		fmt.Printf("   Created: %s\n", run.CreatedAt)
+		fmt.Fprintf(w, runRowFormat, icon, run.Name, run.ID, run.PipelineID, run.Status, run.CreatedAt)
 		if run.StartedAt != nil {
-			fmt.Printf("   Started: %s\n", *run.StartedAt)
+			fmt.Fprintf(w, "   Started: %s\n", *run.StartedAt)
 		}
 		if run.FinishedAt != nil {
-			fmt.Printf("   Finished: %s\n", *run.FinishedAt)
+			fmt.Fprintf(w, "   Finished: %s\n", *run.FinishedAt)
 		}
 		if run.Duration != nil {
-			fmt.Printf("   Duration: %.2fs\n", *run.Duration)
+			fmt.Fprintf(w, "   Duration: %.2fs\n", *run.Duration)
 		}
-		fmt.Println()
+		fmt.Fprintln(w)
 	}
 }
 
 // PrintRunDetails displays detailed information about a run
 func PrintRunDetails(run *client.Run) {
-	emoji := StatusEmojis[run.Status]
-	if emoji == "" {
-		emoji = "❓"
-	}
+	w := newWriter()
+	defer w.Flush()
+
+	icon := statusIcon(run.Status)
 
-	fmt.Printf("\n%s Run: %s\n", emoji, run.Name)
-	fmt.Printf("🏃 Run ID: %s\n", run.ID)
-	fmt.Printf("📋 Pipeline ID: %s\n", run.PipelineID)
-	fmt.Printf("📊 Status: %s\n", run.Status)
-	fmt.Printf("🕐 Created: %s\n", run.CreatedAt)
+	fmt.Fprintf(w, "\n%s Run: %s\n", icon, run.Name)
+	fmt.Fprintf(w, "%sRun ID: %s\n", Icon("runs"), run.ID)
+	fmt.Fprintf(w, "%sPipeline ID: %s\n", Icon("list"), run.PipelineID)
+	fmt.Fprintf(w, "%sStatus: %s\n", Icon("status"), run.Status)
+	fmt.Fprintf(w, "%sCreated: %s\n", Icon("time"), run.CreatedAt)
 	if run.StartedAt != nil {
-		fmt.Printf("🕐 Started: %s\n", *run.StartedAt)
+		fmt.Fprintf(w, "%sStarted: %s\n", Icon("time"), *run.StartedAt)
 	}
 	if run.FinishedAt != nil {
-		fmt.Printf("🕐 Finished: %s\n", *run.FinishedAt)
+		fmt.Fprintf(w, "%sFinished: %s\n", Icon("time"), *run.FinishedAt)
 	}
 	if run.Duration != nil {
-		fmt.Printf("⏱️  Duration: %.2f seconds\n", *run.Duration)
-	}
-
-	if len(run.Steps) > 0 {
-		fmt.Println("\n📝 Steps:")
-		for i, step := range run.Steps {
-			stepEmoji := StatusEmojis[step.Status]
-			if stepEmoji == "" {
-				stepEmoji = "❓"
-			}
-
-			fmt.Printf("  %d. %s %s [%s]\n", i+1, stepEmoji, step.Name, step.Status)
-			if step.Output != "" && strings.TrimSpace(step.Output) != "" {
-				fmt.Printf("     📤 Output: %s\n", strings.TrimSpace(step.Output))
-			}
-			if step.Error != "" && strings.TrimSpace(step.Error) != "" {
-				fmt.Printf("     🚨 Error: %s\n", strings.TrimSpace(step.Error))
-			}
-		}
+		fmt.Fprintf(w, "%sDuration: %.2f seconds\n", Icon("duration"), *run.Duration)
 	}
+
+	writeSteps(w, run.Steps)
 }
 
 // PrintSuccess prints a success message with emoji
 func PrintSuccess(message string) {
-	fmt.Printf("✅ %s\n", message)
+	fmt.Printf("%s%s\n", Icon("success"), message)
 }
 
 // PrintError prints an error message with emoji
 func PrintError(message string) {
-	fmt.Printf("❌ %s\n", message)
+	fmt.Printf("%s%s\n", Icon("failure"), message)
 }
 
 // PrintInfo prints an info message with emoji
 func PrintInfo(message string) {
-	fmt.Printf("ℹ️  %s\n", message)
+	fmt.Printf("%s%s\n", Icon("info"), message)
 }
 
 // PrintWarning prints a warning message with emoji
 func PrintWarning(message string) {
-	fmt.Printf("⚠️  %s\n", message)
+	fmt.Printf("%s%s\n", Icon("warning"), message)
 }
 
 // FormatDuration formats a duration in seconds to a human-readable string
@@ -1,22 +1,41 @@
 import os
 import sys
+import atexit
+import bisect
 import logging
-import json
+import logging.handlers
+import queue
 import time
 import datetime
 import subprocess
 import threading
 import traceback
+from collections.abc import MutableMapping
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any
 from enum import Enum
 import uuid
+from jsonutil import dumps as _json_dumps, loads as _json_loads
+import storage_paths
 import pickle
+import re
+import select
+import shlex
+import shutil
+import tempfile
+from functools import lru_cache
 try:
     import fcntl  # Unix only - for file locking
     HAS_FCNTL = True
 except ImportError:
     HAS_FCNTL = False  # Windows doesn't have fcntl
+try:
+    from _pickle import Pickler, Unpickler  # C implementation, never the pure-Python fallback
+except ImportError:
+    from pickle import Pickler, Unpickler
+# pidfd_open needs Python 3.9+ and Linux 5.3+; the kernel part is checked per call
+HAS_PIDFD = hasattr(os, 'pidfd_open') and hasattr(select, 'poll')
 
 class PipelineStatus(Enum):
     PENDING = "pending"
@@ -32,6 +51,10 @@ class StepStatus(Enum):
     FAILED = "failed"
     SKIPPED = "skipped"
 
+# Direct value -> member lookups, cheaper than calling the Enum class
+_PIPELINE_STATUS_MAP = {s.value: s for s in PipelineStatus}
+_STEP_STATUS_MAP = {s.value: s for s in StepStatus}
+
 def setup_logging():
     """Setup logging configuration"""
     # Determine log file path
@@ -43,31 +66,165 @@ def setup_logging():
         os.makedirs(log_dir, exist_ok=True)
         log_file = os.path.join(log_dir, 'agent.log')
     
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s\n',
-        handlers=[
+    root = logging.getLogger()
+    if any(isinstance(handler, logging.handlers.QueueHandler) for handler in root.handlers):
+        return logging.getLogger(__name__)
+    
+    if root.handlers:
+        # The host process (agent_interface.py, the API) configured logging first; keep its
+        # handlers and level, only moved behind the queue
+        handlers = list(root.handlers)
+        for handler in handlers:
+            root.removeHandler(handler)
+    else:
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s\n')
+        handlers = [
             logging.StreamHandler(sys.stderr),  # Changed to stderr to avoid polluting stdout JSON
             logging.FileHandler(log_file, mode='a')
         ]
-    )
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        root.setLevel(logging.INFO)
+    
+    # Callers only enqueue records; a listener thread does the actual stream/file writes
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop)
     return logging.getLogger(__name__)
 
 logger = setup_logging()
 
-@dataclass
+def _format_timestamp(ns: Optional[int]) -> Optional[str]:
+    """Format a time.time_ns() timestamp as an ISO 8601 string"""
+    if ns is None:
+        return None
+    return datetime.datetime.fromtimestamp(ns / 1e9).isoformat()
+
+def _parse_timestamp(value: Any) -> Optional[int]:
+    """Convert a persisted timestamp (ns int or legacy ISO string) to ns"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, int):
+        return value
+    return round(datetime.datetime.fromisoformat(value).timestamp() * 1e6) * 1000
+
+# Matches ${NAME} and $NAME variable references in step commands
+_VAR_RE = re.compile(r'\$\{(\w+)\}|\$(\w+)')
+# Pipeline variables are exported to steps, so their names must be valid environment names
+_VAR_NAME_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*\Z')
+# Variables that would change how steps are found, loaded or interpreted rather than what they see
+_RESERVED_VARIABLES = frozenset({
+    'PATH', 'HOME', 'SHELL', 'IFS', 'ENV', 'BASH_ENV', 'CDPATH', 'PS4',
+    'PYTHONPATH', 'PYTHONHOME', 'PYTHONSTARTUP', 'NODE_OPTIONS', 'PERL5OPT', 'RUBYOPT',
+})
+_RESERVED_PREFIXES = ('LD_', 'DYLD_', 'BASH_FUNC_')
+
+def _variables_error(variables: Any) -> Optional[str]:
+    """Describe what is wrong with a pipeline's variables, or return None if they can be exported"""
+    if not isinstance(variables, dict):
+        return "Pipeline 'variables' must be an object"
+    for name, value in variables.items():
+        if not _VAR_NAME_RE.match(name):
+            return f"Invalid variable name {name!r}: use letters, digits and underscores"
+        if name in _RESERVED_VARIABLES or name.startswith(_RESERVED_PREFIXES):
+            return f"Variable name {name!r} is reserved"
+        if '\0' in str(value):
+            return f"Variable {name!r} contains a NUL character"
+    return None
+
+# Number of events the append-only log may hold before it is compacted into a snapshot
+COMPACT_EVERY = 500
+
+# Detached runs are started as `agent_interface.py execute_run` next to this module
+AGENT_DIR = os.path.dirname(os.path.abspath(__file__))
+_EXECUTE_RUN_ARGV = (sys.executable, os.path.join(AGENT_DIR, 'agent_interface.py'), 'execute_run')
+
+# Anything a plain argv cannot express (pipes, redirection, expansion, globbing, ...)
+_SHELL_META_RE = re.compile(r'[|&;<>()$`\\*?\[\]#~=%{}!\n]')
+# Shell builtins that also exist as programs; the external versions differ (echo -e, printf
+# escapes, test operators), so commands naming them keep going through /bin/sh
+_SHELL_BUILTINS = frozenset({
+    'echo', 'printf', 'test', '[', 'true', 'false', 'pwd', 'kill', 'type', 'command',
+    'read', 'getopts', 'wait', 'umask', 'ulimit', 'alias', 'unalias', 'hash', 'times', 'time',
+})
+# Only the tail of a step's stdout/stderr is kept, so a noisy step cannot balloon the state files
+MAX_STEP_OUTPUT = int(os.environ.get('MAX_STEP_OUTPUT', 64 * 1024))
+
+@lru_cache(maxsize=1024)
+def _direct_argv(command: str) -> Optional[tuple]:
+    """Split a command that can be exec'd without /bin/sh, or return None"""
+    if _SHELL_META_RE.search(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    if not argv or argv[0] in _SHELL_BUILTINS:
+        return None
+    return tuple(argv)
+
+def _wait_process(proc: subprocess.Popen, timeout: int) -> int:
+    """Wait for a child, sleeping on a pidfd instead of Popen.wait()'s polling loop where possible"""
+    if HAS_PIDFD:
+        try:
+            pidfd = os.pidfd_open(proc.pid)
+        except OSError:
+            pidfd = None  # Kernel older than 5.3
+        if pidfd is not None:
+            try:
+                poller = select.poll()
+                poller.register(pidfd, select.POLLIN)
+                # The pidfd becomes readable the moment the child exits
+                if not poller.poll(timeout * 1000):
+                    raise subprocess.TimeoutExpired(proc.args, timeout)
+            finally:
+                os.close(pidfd)
+            return proc.wait()
+    return proc.wait(timeout=timeout)
+
+def _read_tail(f) -> str:
+    """Decode at most MAX_STEP_OUTPUT bytes from the end of a spooled output file"""
+    size = f.seek(0, os.SEEK_END)
+    skipped = max(size - MAX_STEP_OUTPUT, 0)
+    f.seek(skipped)
+    text = f.read().decode('utf-8', errors='replace')
+    if skipped:
+        text = f"[... {skipped} bytes truncated ...]\n" + text
+    return text
+
+def _spawn(command: str, timeout: int, env: Optional[Dict[str, str]] = None):
+    """Run a command with output spooled to temp files; returns (returncode, stdout, stderr)"""
+    argv = _direct_argv(command)
+    # Resolved per call against the step's own PATH; builtins with no program, such as cd, fall back to the shell
+    executable = shutil.which(argv[0], path=(env or os.environ).get('PATH')) if argv else None
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        if executable is not None:
+            proc = subprocess.Popen(argv, executable=executable, stdout=out, stderr=err, env=env)
+        else:
+            proc = subprocess.Popen(command, shell=True, stdout=out, stderr=err, env=env)
+        try:
+            returncode = _wait_process(proc, timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+        return returncode, _read_tail(out), _read_tail(err)
+
+@dataclass(slots=True)
 class PipelineStep:
-    name: str = field(default="")
-    description: str = field(default="")
-    command: str = field(default="")
-    timeout: int = field(default=300)
-    retry_count: int = field(default=0)
-    continue_on_error: bool = field(default=False)
-    status: StepStatus = field(default=StepStatus.PENDING)
-    start_time: str = field(default="")
-    end_time: str = field(default="")
-    output: str = field(default="")
-    error: str = field(default="")
+    name: str = ""
+    description: str = ""
+    command: str = ""
+    timeout: int = 300
+    retry_count: int = 0
+    continue_on_error: bool = False
+    status: StepStatus = StepStatus.PENDING
+    start_time: Optional[int] = None  # time.time_ns(), formatted lazily in to_dict
+    end_time: Optional[int] = None
+    output: str = ""
+    error: str = ""
 
     @classmethod
     def from_dict(cls, step_data: Dict[str, Any]) -> 'PipelineStep':
@@ -83,11 +240,11 @@ class PipelineStep:
         
         # Restore runtime state if present
         if 'status' in step_data:
-            step.status = StepStatus(step_data['status'])
+            step.status = _STEP_STATUS_MAP[step_data['status']]
         if 'start_time' in step_data:
-            step.start_time = step_data['start_time']
+            step.start_time = _parse_timestamp(step_data['start_time'])
         if 'end_time' in step_data:
-            step.end_time = step_data['end_time']
+            step.end_time = _parse_timestamp(step_data['end_time'])
         if 'output' in step_data:
             step.output = step_data['output']
         if 'error' in step_data:
@@ -105,25 +262,25 @@ class PipelineStep:
             'retry_count': self.retry_count,
             'continue_on_error': self.continue_on_error,
             'status': self.status.value,
-            'start_time': self.start_time,
-            'end_time': self.end_time,
+            'start_time': _format_timestamp(self.start_time) or '',
+            'end_time': _format_timestamp(self.end_time) or '',
             'output': self.output,
             'error': self.error
         }
 
-@dataclass
+@dataclass(slots=True)
 class PipelineRun:
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    pipeline_id: str = field(default="")
-    name: str = field(default="")
-    version: str = field(default="1.0.0")
-    description: str = field(default="")
+    pipeline_id: str = ""
+    name: str = ""
+    version: str = "1.0.0"
+    description: str = ""
     variables: Dict[str, Any] = field(default_factory=dict)
     steps: List[PipelineStep] = field(default_factory=list)
-    status: PipelineStatus = field(default=PipelineStatus.PENDING)
+    status: PipelineStatus = PipelineStatus.PENDING
     created_at: str = field(default_factory=lambda: datetime.datetime.now().isoformat())
-    started_at: Optional[str] = None
-    finished_at: Optional[str] = None
+    started_at: Optional[int] = None  # time.time_ns(), formatted lazily in to_dict
+    finished_at: Optional[int] = None
     total_duration: Optional[float] = None
 
     @classmethod
@@ -148,10 +305,10 @@ class PipelineRun:
             version=run_data['version'],
             description=run_data['description'],
             variables=run_data['variables'],
-            status=PipelineStatus(run_data['status']),
+            status=_PIPELINE_STATUS_MAP[run_data['status']],
             created_at=run_data['created_at'],
-            started_at=run_data['started_at'],
-            finished_at=run_data['finished_at'],
+            started_at=_parse_timestamp(run_data['started_at']),
+            finished_at=_parse_timestamp(run_data['finished_at']),
             total_duration=run_data['total_duration'],
             steps=[PipelineStep.from_dict(step_data) for step_data in run_data['steps']]
         )
@@ -167,8 +324,8 @@ class PipelineRun:
             'variables': self.variables,
             'status': self.status.value,
             'created_at': self.created_at,
-            'started_at': self.started_at,
-            'finished_at': self.finished_at,
+            'started_at': _format_timestamp(self.started_at),
+            'finished_at': _format_timestamp(self.finished_at),
             'total_duration': self.total_duration,
             'steps': [step.to_dict() for step in self.steps]
         }
@@ -181,144 +338,416 @@ class PipelineRun:
             'name': self.name,
             'status': self.status.value,
             'created_at': self.created_at,
-            'started_at': self.started_at,
-            'finished_at': self.finished_at,
+            'started_at': _format_timestamp(self.started_at),
+            'finished_at': _format_timestamp(self.finished_at),
             'total_duration': self.total_duration
         }
 
+# Field order of every run summary, active or finished, so all rows serialize with one shape
+_RUN_SUMMARY_FIELDS = ('id', 'pipeline_id', 'name', 'status', 'created_at', 'started_at', 'finished_at', 'total_duration')
+
+class _LazyRuns(MutableMapping):
+    """Active runs kept as serialized dicts until a PipelineRun is actually needed"""
+    
+    def __init__(self, raw: Optional[Dict[str, Dict[str, Any]]] = None):
+        self._raw = dict(raw or {})
+        self._objs: Dict[str, PipelineRun] = {}
+    
+    def __getitem__(self, run_id: str) -> PipelineRun:
+        run = self._objs.get(run_id)
+        if run is None:
+            run = PipelineRun.from_dict(self._raw.pop(run_id))
+            self._objs[run_id] = run
+        return run
+    
+    def __setitem__(self, run_id: str, run: PipelineRun):
+        self._raw.pop(run_id, None)
+        self._objs[run_id] = run
+    
+    def __delitem__(self, run_id: str):
+        if self._objs.pop(run_id, None) is None:
+            del self._raw[run_id]
+    
+    def __contains__(self, run_id) -> bool:
+        return run_id in self._objs or run_id in self._raw
+    
+    def __iter__(self):
+        yield from list(self._objs)
+        yield from list(self._raw)
+    
+    def __len__(self) -> int:
+        return len(self._objs) + len(self._raw)
+    
+    def add_raw(self, run_data: Dict[str, Any]):
+        """Register a run in its serialized form without building objects"""
+        self._objs.pop(run_data['id'], None)
+        self._raw[run_data['id']] = run_data
+    
+    def peek(self, run_id: str, key: str) -> Any:
+        """Read a field stored identically in both forms (e.g. pipeline_id, created_at)"""
+        run = self._objs.get(run_id)
+        return getattr(run, key) if run is not None else self._raw[run_id][key]
+    
+    def status(self, run_id: str) -> str:
+        """Status value of a run without materializing it"""
+        run = self._objs.get(run_id)
+        return run.status.value if run is not None else self._raw[run_id]['status']
+    
+    def summary(self, run_id: str, with_steps: bool = False) -> Dict[str, Any]:
+        """Summary dict of a run, read straight from the raw form when possible"""
+        run = self._objs.get(run_id)
+        if run is not None:
+            result = run.to_summary_dict()
+            if with_steps:
+                result['steps'] = [step.to_dict() for step in run.steps]
+            return result
+        
+        run_data = self._raw[run_id]
+        result = {key: run_data.get(key) for key in _RUN_SUMMARY_FIELDS}
+        if with_steps:
+            result['steps'] = run_data.get('steps', [])
+        return result
+    
+    def raw(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Serialized form of a run that has not been materialized yet"""
+        return self._raw.get(run_id)
+    
+    def to_dicts(self) -> Dict[str, Dict[str, Any]]:
+        """Serialized form of every run, for snapshots"""
+        result = dict(self._raw)
+        for run_id, run in self._objs.items():
+            result[run_id] = run.to_dict()
+        return result
+
 class CICDAgent:
     def __init__(self, data_file=None):
         if data_file is None:
-            # Default paths for different environments
-            if os.path.exists('/app'):
-                data_file = '/app/data/agent_data.pkl'
-            else:
-                # For local development
-                data_file = os.path.join(os.path.dirname(__file__), 'data', 'agent_data.pkl')
+            data_file = storage_paths.default_data_file()
         self.data_file = data_file
+        self.log_file = storage_paths.log_file(data_file)
+        self.lock_file = storage_paths.lock_file(data_file)
         self.pipelines = {}
-        self.runs = {}
-        self.run_history = []
+        self.runs = _LazyRuns()
+        # Finished runs by run ID, in the order they finished
+        self.run_history: Dict[str, Dict[str, Any]] = {}
+        # Secondary indexes: pipeline ID -> active run IDs / finished run IDs by created_at
+        self._runs_by_pipeline: Dict[str, set] = {}
+        self._history_by_pipeline: Dict[str, List[str]] = {}
+        
+        # Events appended by this instance are skipped when replaying the log
+        self._writer_id = uuid.uuid4().hex
+        self._lock_fd = None
+        self._lock_pid = None
+        self._snapshot_stat = None
+        self._log_offset = 0
+        self._log_events = 0
+        
+        # flock does not exclude threads sharing the fd, so threads serialize here first
+        self._thread_lock = threading.RLock()
+        # Set once the log is long enough to compact; flushed at exit
+        self._dirty = False
         
         os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
         
         self._load_data()
-        self._cleanup_data()
+        
+        atexit.register(self._flush)
 
     # def __new__(cls, *args, **kwargs):
     #     if not hasattr(cls, 'instance'):
     #         cls.instance = super(CICDAgent, cls).__new__(cls)
     #     return cls.instance
     
+    @contextmanager
+    def _storage_lock(self, exclusive: bool = False):
+        """Hold the cross-process lock guarding the snapshot and event log"""
+        with self._thread_lock:
+            if not HAS_FCNTL:
+                yield
+                return
+            
+            # flock is tied to the open file description, so forked children need their own
+            if self._lock_fd is None or self._lock_pid != os.getpid():
+                self._lock_fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+                self._lock_pid = os.getpid()
+            
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+    
+    @staticmethod
+    def _stat_key(path: str):
+        """Identify a file version by inode, mtime and size"""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+    
     def _load_data(self):
-        """Load persisted data from file"""
+        """Load the persisted snapshot and replay the event log on top of it"""
+        with self._storage_lock():
+            self._load_snapshot()
+            self._catch_up(skip_own=False)
+        
+        logger.info("Loaded %s pipelines, %s runs, %s run history", len(self.pipelines), len(self.runs), len(self.run_history))
+    
+    def _load_snapshot(self):
+        """Load the compacted snapshot from file"""
+        self._snapshot_stat = self._stat_key(self.data_file)
+        self._log_offset = 0
+        self._log_events = 0
+        # Snapshots are replaced atomically, so a failed load means a foreign or unreadable file
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'rb') as f:
-                    if HAS_FCNTL:
-                        fcntl.flock(f.fileno(), fcntl.LOCK_SH)
-                    data = pickle.load(f)
-                    if HAS_FCNTL:
-                        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-                    
-                    self.pipelines = data.get('pipelines', {})
-                    
-                    self.runs = {}
-                    for run_id, run_data in data.get('runs', {}).items():
-                        run = PipelineRun.from_dict(run_data)
-                        self.runs[run_id] = run
-                    
-                    self.run_history = data.get('run_history', [])
-                    
-                    logger.info(f"Loaded {len(self.pipelines)} pipelines, {len(self.runs)} runs, {len(self.run_history)} run history")
+            with open(self.data_file, 'rb') as f:
+                data = Unpickler(f).load()
+        except FileNotFoundError:
+            data = {}
         except Exception as e:
-            logger.warning(f"Failed to load persisted data: {str(e)}")
-            # Try to recover by clearing corrupted data
+            logger.warning("Failed to load persisted data: %s", e)
+            # Keep it aside instead of overwriting it on the next compaction
             try:
-                if os.path.exists(self.data_file):
-                    backup_file = self.data_file + '.backup'
-                    os.rename(self.data_file, backup_file)
-                    logger.info(f"Moved corrupted data file to {backup_file}")
-            except:
+                backup_file = self.data_file + '.backup'
+                os.rename(self.data_file, backup_file)
+                logger.info("Moved unreadable data file to %s", backup_file)
+            except OSError:
                 pass
-            # Initialize with empty data if loading fails
-            self.pipelines = {}
-            self.runs = {}
-            self.run_history = []
+            data = {}
+        
+        self.pipelines = data.get('pipelines', {})
+        # Runs are only turned into PipelineRun objects when touched
+        self.runs = _LazyRuns(data.get('runs', {}))
+        run_history = data.get('run_history', {})
+        if isinstance(run_history, list):
+            # Older snapshots kept history as a list, sometimes with enum statuses
+            run_history = {hist_run['id']: dict(hist_run, status=self._get_status_value(hist_run.get('status')))
+                           for hist_run in run_history}
+        self.run_history = run_history
+        
+        self._runs_by_pipeline = {}
+        for run_id in self.runs:
+            self._runs_by_pipeline.setdefault(self.runs.peek(run_id, 'pipeline_id'), set()).add(run_id)
+        self._rebuild_history_index()
     
-    def _save_data(self):
-        """Save current data to file"""
+    def _rebuild_history_index(self):
+        """Recompute the per-pipeline history index from run_history"""
+        self._history_by_pipeline = {}
+        for run_id, hist_run in self.run_history.items():
+            self._history_by_pipeline.setdefault(hist_run.get('pipeline_id'), []).append(run_id)
+        for run_ids in self._history_by_pipeline.values():
+            run_ids.sort(key=self._history_created_at)
+    
+    def _history_created_at(self, run_id: str) -> str:
+        """Sort key keeping per-pipeline history in creation order"""
+        return self.run_history[run_id].get('created_at', '')
+    
+    def _remove_history_run(self, run_id: str) -> bool:
+        """Drop a finished run and its index entry"""
+        hist_run = self.run_history.pop(run_id, None)
+        if hist_run is None:
+            return False
+        pipeline_id = hist_run.get('pipeline_id')
+        run_ids = self._history_by_pipeline.get(pipeline_id)
+        if run_ids is not None:
+            run_ids.remove(run_id)
+            if not run_ids:
+                del self._history_by_pipeline[pipeline_id]
+        return True
+    
+    def _add_run(self, run: PipelineRun):
+        """Register an active run and index it by pipeline"""
+        self.runs[run.id] = run
+        self._runs_by_pipeline.setdefault(run.pipeline_id, set()).add(run.id)
+    
+    def _remove_run(self, run_id: str) -> bool:
+        """Drop an active run and its index entry"""
+        if run_id not in self.runs:
+            return False
+        pipeline_id = self.runs.peek(run_id, 'pipeline_id')
+        del self.runs[run_id]
+        run_ids = self._runs_by_pipeline.get(pipeline_id)
+        if run_ids is not None:
+            run_ids.discard(run_id)
+            if not run_ids:
+                del self._runs_by_pipeline[pipeline_id]
+        return True
+    
+    def _sync(self):
+        """Bring in-memory state up to date with the files (storage lock must be held)"""
+        if self._stat_key(self.data_file) != self._snapshot_stat:
+            # Another process compacted the log - start over from its snapshot
+            self._load_snapshot()
+            self._catch_up(skip_own=False)
+        else:
+            self._catch_up()
+    
+    def refresh(self):
+        """Pick up changes persisted by other processes since the last load"""
+        with self._storage_lock():
+            self._sync()
+    
+    def _catch_up(self, skip_own: bool = True):
+        """Apply events appended to the log since the last read"""
         try:
-            serializable_pipelines = {}
-            for pid, pipeline in self.pipelines.items():
-                serializable_pipeline = pipeline.copy()
-                serializable_pipelines[pid] = serializable_pipeline
-            
-            serializable_runs = {}
-            for run_id, run in self.runs.items():
-                serializable_runs[run_id] = run.to_dict()
-            
-            data = {
-                'pipelines': serializable_pipelines,
-                'runs': serializable_runs,
-                'run_history': self.run_history
-            }
-            
-            with open(self.data_file, 'wb') as f:
-                if HAS_FCNTL:
-                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-                pickle.dump(data, f)
-                if HAS_FCNTL:
-                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-                
-            logger.debug(f"Saved {len(serializable_pipelines)} pipelines to {self.data_file}")
-            
+            with open(self.log_file, 'rb') as f:
+                f.seek(self._log_offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            return
+        
+        # Leave a partially written trailing line for the next read
+        end = chunk.rfind(b'\n') + 1
+        for line in chunk[:end].splitlines():
+            try:
+                event = _json_loads(line)
+            except ValueError:
+                logger.warning("Skipping malformed event in %s", self.log_file)
+                continue
+            if skip_own and event.get('writer') == self._writer_id:
+                continue
+            self._log_events += 1
+            self._apply_event(event)
+        self._log_offset += end
+    
+    def _append_event(self, event: Dict[str, Any]):
+        """Persist a single state change by appending it to the event log"""
+        event['writer'] = self._writer_id
+        try:
+            line = _json_dumps(event) + b'\n'
+            with self._storage_lock():
+                fd = os.open(self.log_file, os.O_APPEND | os.O_WRONLY | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, line)
+                finally:
+                    os.close(fd)
+            self._log_events += 1
         except Exception as e:
-            logger.error(f"Failed to save data: {str(e)}")
+            logger.error("Failed to append event: %s", e)
+            return
+        
+        if self._log_events >= COMPACT_EVERY:
+            self._dirty = True
+    
+    def _flush(self):
+        """Compact the event log if enough events have piled up"""
+        if self._dirty:
+            self._save_data()
+    
+    def _apply_event(self, event: Dict[str, Any]):
+        """Apply an event written by another process to in-memory state"""
+        kind = event.get('type')
+        
+        if kind == 'pipeline_created':
+            pipeline = event['pipeline']
+            self.pipelines[pipeline['id']] = pipeline
+        elif kind == 'pipeline_deleted':
+            self.pipelines.pop(event['pipeline_id'], None)
+        elif kind == 'run_created':
+            run_data = event['run']
+            self.runs.add_raw(run_data)
+            self._runs_by_pipeline.setdefault(run_data['pipeline_id'], set()).add(run_data['id'])
+        elif kind == 'run_deleted':
+            if not self._remove_run(event['run_id']):
+                self._remove_history_run(event['run_id'])
+        elif event.get('run_id') not in self.runs:
+            # Remaining events only concern active runs that are already gone here
+            return
+        elif kind == 'run_finished' and self.runs.raw(event['run_id']) is not None:
+            # Never touched here, so finish it without building a PipelineRun
+            history_run = dict(self.runs.raw(event['run_id']))
+            history_run['status'] = event['status']
+            history_run['finished_at'] = _format_timestamp(_parse_timestamp(event['finished_at']))
+            history_run['total_duration'] = event['total_duration']
+            self._add_history_run(history_run)
+            self._remove_run(history_run['id'])
+        else:
+            self._apply_run_event(kind, self.runs[event['run_id']], event)
     
-    def _cleanup_data(self):
-        """Clean up any data inconsistencies after loading"""
+    def _apply_run_event(self, kind: str, run: PipelineRun, event: Dict[str, Any]):
+        """Apply an event that updates a single active run"""
+        if kind == 'run_started':
+            run.status = PipelineStatus.RUNNING
+            run.started_at = _parse_timestamp(event['started_at'])
+        elif kind == 'run_cancelled':
+            run.status = PipelineStatus.CANCELLED
+        elif kind == 'step_started':
+            step = run.steps[event['index']]
+            step.status = StepStatus.RUNNING
+            step.start_time = _parse_timestamp(event['start_time'])
+        elif kind == 'step_finished':
+            run.steps[event['index']] = PipelineStep.from_dict(event['step'])
+        elif kind == 'run_finished':
+            run.status = _PIPELINE_STATUS_MAP[event['status']]
+            run.finished_at = _parse_timestamp(event['finished_at'])
+            run.total_duration = event['total_duration']
+            self._move_run_to_history(run)
+    
+    def _save_data(self):
+        """Compact the event log into a fresh snapshot file"""
         try:
-            cleaned_run_history = []
-            for run in self.run_history:
-                cleaned_run = run.copy()
+            with self._storage_lock(exclusive=True):
+                self._sync()
                 
-                if hasattr(cleaned_run.get('status'), 'value'):
-                    cleaned_run['status'] = cleaned_run['status'].value
-                elif cleaned_run.get('status') is None:
-                    cleaned_run['status'] = 'unknown'
+                # Pipelines and history are already plain dicts; only materialized runs need to_dict()
+                data = {
+                    'pipelines': self.pipelines,
+                    'runs': self.runs.to_dicts(),
+                    'run_history': self.run_history
+                }
                 
-                cleaned_run_history.append(cleaned_run)
-            
-            self.run_history = cleaned_run_history
-            logger.debug("Data cleanup completed")
+                # Write aside and rename so a crash mid-write never leaves a truncated snapshot
+                tmp_file = self.data_file + '.tmp'
+                with open(tmp_file, 'wb') as f:
+                    Pickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self.data_file)
+                
+                # Everything in the log is now part of the snapshot
+                try:
+                    os.remove(self.log_file)
+                except FileNotFoundError:
+                    pass
+                self._snapshot_stat = self._stat_key(self.data_file)
+                self._log_offset = 0
+                self._log_events = 0
+                self._dirty = False
+                
+            logger.debug("Saved %s pipelines to %s", len(self.pipelines), self.data_file)
             
         except Exception as e:
-            logger.warning(f"Error during data cleanup: {str(e)}")
-
+            logger.error("Failed to save data: %s", e)
+    
     def _get_status_value(self, status_obj) -> str:
         """Safely extract status value from status object"""
-        if hasattr(status_obj, 'value'):
-            return status_obj.value
+        # Stored statuses are almost always plain strings; check that with a pointer compare first
+        if type(status_obj) is str:
+            return status_obj
         elif status_obj is None:
             return 'unknown'
-        else:
-            return str(status_obj)
+        value = getattr(status_obj, 'value', None)
+        return value if value is not None else str(status_obj)
 
     def load_pipeline_from_file(self, pipeline_file: str) -> str:
         """Load pipeline from JSON file and return pipeline ID"""
         try:
-            logger.info(f"Loading pipeline from {pipeline_file}")
-            with open(pipeline_file, 'r') as file:
-                pipeline_config = json.load(file)
+            logger.info("Loading pipeline from %s", pipeline_file)
+            # Parse the raw bytes; orjson decodes UTF-8 itself, so no intermediate str is built
+            with open(pipeline_file, 'rb') as file:
+                pipeline_config = _json_loads(file.read())
                 
             return self.create_pipeline(pipeline_config)
         except Exception as e:
-            logger.error(f"Failed to load pipeline from {pipeline_file}: {str(e)}")
+            logger.error("Failed to load pipeline from %s: %s", pipeline_file, e)
             raise
 
     def create_pipeline(self, pipeline_config: Dict[str, Any]) -> str:
         """Create a new pipeline definition and return its ID"""
+        error = _variables_error(pipeline_config.get('variables', {}))
+        if error:
+            raise ValueError(error)
         pipeline_id = str(uuid.uuid4())
         
         pipeline = {
@@ -333,8 +762,8 @@ class CICDAgent:
         }
         
         self.pipelines[pipeline_id] = pipeline
-        self._save_data()
-        logger.info(f"Created pipeline definition {pipeline['name']} with ID {pipeline_id}")
+        self._append_event({'type': 'pipeline_created', 'pipeline': pipeline})
+        logger.info("Created pipeline definition %s with ID %s", pipeline['name'], pipeline_id)
         return pipeline_id
     
     def create_run(self, pipeline_id: str) -> str:
@@ -345,9 +774,9 @@ class CICDAgent:
         pipeline_def = self.pipelines[pipeline_id]
         run = PipelineRun.from_config(pipeline_id, pipeline_def)
             
-        self.runs[run.id] = run
-        self._save_data()
-        logger.info(f"Created run {run.id} for pipeline {pipeline_def['name']}")
+        self._add_run(run)
+        self._append_event({'type': 'run_created', 'run': run.to_dict()})
+        logger.info("Created run %s for pipeline %s", run.id, pipeline_def['name'])
         return run.id
 
     def run_pipeline(self, pipeline_id: str, background: bool = True) -> str:
@@ -357,24 +786,20 @@ class CICDAgent:
         if background:
             # Start execution as a separate subprocess to survive script exit
             try:
-                import subprocess
-                import sys
-                import os
-                
                 # Create a subprocess that will execute the run independently  
                 subprocess.Popen([
-                    sys.executable, 'agent_interface.py', 'execute_run', 
-                    json.dumps({'run_id': run_id})
+                    *_EXECUTE_RUN_ARGV,
+                    _json_dumps({'run_id': run_id}).decode()
                 ], 
-                cwd=os.path.dirname(os.path.abspath(__file__)),
+                cwd=AGENT_DIR,
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
                 start_new_session=True  # Detach from parent process
                 )
-                logger.info(f"Started background execution subprocess for run {run_id}")
+                logger.info("Started background execution subprocess for run %s", run_id)
                 return run_id
             except Exception as e:
-                logger.error(f"Failed to start background execution for run {run_id}: {e}")
+                logger.error("Failed to start background execution for run %s: %s", run_id, e)
                 # Fall back to synchronous execution
                 success = self._execute_run(run_id)
                 return run_id if success else None
@@ -384,40 +809,49 @@ class CICDAgent:
             
     def _execute_run_wrapper(self, run_id: str):
         """Wrapper for _execute_run to handle exceptions in background threads"""
-        logger.info(f"Background thread started for run {run_id}")
+        logger.info("Background thread started for run %s", run_id)
         try:
             self._execute_run(run_id)
-            logger.info(f"Background thread completed for run {run_id}")
+            logger.info("Background thread completed for run %s", run_id)
         except Exception as e:
-            logger.error(f"Background execution failed for run {run_id}: {str(e)}")
+            logger.error("Background execution failed for run %s: %s", run_id, e)
             logger.error(traceback.format_exc())
             # Update run status to failed if exception occurs
             if run_id in self.runs:
-                self.runs[run_id].status = PipelineStatus.FAILED
-                self.runs[run_id].finished_at = datetime.datetime.now().isoformat()
-                self._move_run_to_history(self.runs[run_id])
-                self._save_data()
+                run = self.runs[run_id]
+                run.status = PipelineStatus.FAILED
+                run.finished_at = time.time_ns()
+                self._move_run_to_history(run)
+                self._append_run_finished(run)
     
     def _execute_run(self, run_id: str) -> bool:
         """Execute a pipeline run"""
         if run_id not in self.runs:
-            logger.error(f"Run {run_id} not found")
+            logger.error("Run %s not found", run_id)
             return False
             
         run = self.runs[run_id]
         
         try:
-            logger.info(f"Starting run {run_id} for pipeline {run.name}")
+            logger.info("Starting run %s for pipeline %s", run_id, run.name)
             run.status = PipelineStatus.RUNNING
-            run.started_at = datetime.datetime.now().isoformat()
+            run.started_at = time.time_ns()
+            self._append_event({'type': 'run_started', 'run_id': run_id, 'started_at': run.started_at})
             
-            start_time = time.time()
+            # Pipeline variables are also exported to every step; build the environment once per run.
+            # Definitions saved before names were validated may hold names that must not be exported
+            env = dict(os.environ)
+            error = _variables_error(run.variables)
+            if error is None:
+                env.update((name, str(value)) for name, value in run.variables.items())
+            else:
+                logger.warning("Not exporting variables of run %s: %s", run_id, error)
             
-            for step in run.steps:
-                if run.status == PipelineStatus.CANCELLED:
+            for index, step in enumerate(run.steps):
+                if self._is_cancelled(run):
                     break
                     
-                success = self._execute_step(step, run.variables)
+                success = self._execute_step(run, index, env)
                 
                 if not success and not step.continue_on_error:
                     run.status = PipelineStatus.FAILED
@@ -425,155 +859,185 @@ class CICDAgent:
             else:
                 run.status = PipelineStatus.SUCCESS
             
-            end_time = time.time()
-            run.finished_at = datetime.datetime.now().isoformat()
-            run.total_duration = end_time - start_time
+            run.finished_at = time.time_ns()
+            run.total_duration = (run.finished_at - run.started_at) / 1e9
             
             self._move_run_to_history(run)
-            self._save_data()
-            logger.info(f"Run {run_id} finished with status: {run.status.value}")
+            self._append_run_finished(run)
+            logger.info("Run %s finished with status: %s", run_id, run.status.value)
             return run.status == PipelineStatus.SUCCESS
             
         except Exception as e:
-            logger.error(f"Run {run_id} failed with exception: {str(e)}")
+            logger.error("Run %s failed with exception: %s", run_id, e)
             run.status = PipelineStatus.FAILED
-            run.finished_at = datetime.datetime.now().isoformat()
+            run.finished_at = time.time_ns()
             self._move_run_to_history(run)
-            self._save_data()
+            self._append_run_finished(run)
             return False
     
     def _move_run_to_history(self, run: PipelineRun):
         """Move a completed run to history"""
-        history_run = run.to_dict()
-        
-        self.run_history.append(history_run)
-        
-        if run.id in self.runs:
-            del self.runs[run.id]
+        # This is the only serialization of a finished run; history stays in dict form
+        self._add_history_run(run.to_dict())
+        self._remove_run(run.id)
+    
+    def _add_history_run(self, history_run: Dict[str, Any]):
+        """Append a serialized run to history and index it by pipeline"""
+        # Statuses are stored as plain strings, so nothing needs normalizing on load
+        history_run['status'] = self._get_status_value(history_run['status'])
+        self.run_history[history_run['id']] = history_run
+        run_ids = self._history_by_pipeline.setdefault(history_run['pipeline_id'], [])
+        bisect.insort(run_ids, history_run['id'], key=self._history_created_at)
     
-    def _execute_step(self, step: PipelineStep, variables: Dict[str, str]) -> bool:
+    def _append_run_finished(self, run: PipelineRun):
+        """Record that a run reached its final state"""
+        self._append_event({
+            'type': 'run_finished',
+            'run_id': run.id,
+            'status': run.status.value,
+            'finished_at': run.finished_at,
+            'total_duration': run.total_duration
+        })
+    
+    def _is_cancelled(self, run: PipelineRun) -> bool:
+        """Check whether a run was cancelled, including from another process"""
+        self.refresh()
+        current = self.runs.get(run.id, run)
+        if current.status == PipelineStatus.CANCELLED:
+            run.status = PipelineStatus.CANCELLED
+        return run.status == PipelineStatus.CANCELLED
+    
+    def _execute_step(self, run: PipelineRun, index: int, env: Optional[Dict[str, str]] = None) -> bool:
         """Execute a single pipeline step"""
-        logger.info(f"Executing step: {step.name}")
+        step = run.steps[index]
+        variables = run.variables
+        logger.info("Executing step: %s", step.name)
         step.status = StepStatus.RUNNING
-        step.start_time = datetime.datetime.now().isoformat()
+        step.start_time = time.time_ns()
+        self._append_event({'type': 'step_started', 'run_id': run.id, 'index': index, 'start_time': step.start_time})
         
+        success = self._run_step_command(step, variables, env)
+        # The step dataclass goes to the encoder as-is; from_dict accepts its ns timestamps
+        self._append_event({'type': 'step_finished', 'run_id': run.id, 'index': index, 'step': step})
+        return success
+    
+    def _run_step_command(self, step: PipelineStep, variables: Dict[str, str],
+                          env: Optional[Dict[str, str]] = None) -> bool:
+        """Expand variables and run the step command, retrying on failure"""
         try:
+            # Still expanded textually: definitions use ${VAR} inside single quotes,
+            # where the shell would not expand it. Unknown references are left for the shell
             command = step.command
-            for key, value in variables.items():
-                command = command.replace(f"${{{key}}}", str(value))
-                command = command.replace(f"${key}", str(value))
+            if '$' in command:
+                command = _VAR_RE.sub(
+                    lambda m: str(variables.get(m.group(1) or m.group(2), m.group(0))),
+                    command
+                )
             
-            logger.info(f"Running command: {command}")
+            logger.info("Running command: %s", command)
             
             for attempt in range(step.retry_count + 1):
                 try:
-                    result = subprocess.run(
-                        command,
-                        shell=True,
-                        check=True,
-                        timeout=step.timeout,
-                        capture_output=True,
-                        text=True
-                    )
+                    returncode, stdout, stderr = _spawn(command, step.timeout, env)
                     
-                    step.output = result.stdout
-                    step.status = StepStatus.SUCCESS
-                    step.end_time = datetime.datetime.now().isoformat()
-                    logger.info(f"Step {step.name} completed successfully")
-                    return True
+                    if returncode == 0:
+                        step.output = stdout
+                        step.status = StepStatus.SUCCESS
+                        step.end_time = time.time_ns()
+                        logger.info("Step %s completed successfully", step.name)
+                        return True
                     
-                except subprocess.CalledProcessError as e:
-                    step.error = e.stderr
+                    step.error = stderr
                     if attempt < step.retry_count:
-                        logger.warning(f"Step {step.name} failed (attempt {attempt + 1}), retrying...")
+                        logger.warning("Step %s failed (attempt %s), retrying...", step.name, attempt + 1)
                         time.sleep(2 ** attempt)  # Exponential backoff
                     else:
                         step.status = StepStatus.FAILED
-                        step.end_time = datetime.datetime.now().isoformat()
-                        logger.error(f"Step {step.name} failed after {attempt + 1} attempts: {e.stderr}")
+                        step.end_time = time.time_ns()
+                        logger.error("Step %s failed after %s attempts: %s", step.name, attempt + 1, stderr)
                         return False
                         
                 except subprocess.TimeoutExpired:
                     step.error = f"Command timed out after {step.timeout} seconds"
                     step.status = StepStatus.FAILED
-                    step.end_time = datetime.datetime.now().isoformat()
-                    logger.error(f"Step {step.name} timed out")
+                    step.end_time = time.time_ns()
+                    logger.error("Step %s timed out", step.name)
                     return False
                     
         except Exception as e:
             step.error = str(e)
             step.status = StepStatus.FAILED
-            step.end_time = datetime.datetime.now().isoformat()
-            logger.error(f"Step {step.name} failed with exception: {str(e)}")
+            step.end_time = time.time_ns()
+            logger.error("Step %s failed with exception: %s", step.name, e)
             return False
 
     def cancel_run(self, run_id: str) -> bool:
         """Cancel a running pipeline run"""
         if run_id in self.runs:
             self.runs[run_id].status = PipelineStatus.CANCELLED
-            logger.info(f"Run {run_id} cancelled")
-            self._save_data()
+            logger.info("Run %s cancelled", run_id)
+            self._append_event({'type': 'run_cancelled', 'run_id': run_id})
             return True
         return False
     
     def cancel_pipeline(self, pipeline_id: str) -> bool:
         """Cancel all active runs for a pipeline"""
         cancelled = False
-        for run_id, run in self.runs.items():
-            if run.pipeline_id == pipeline_id:
-                run.status = PipelineStatus.CANCELLED
-                cancelled = True
+        for run_id in list(self._runs_by_pipeline.get(pipeline_id, ())):
+            self.runs[run_id].status = PipelineStatus.CANCELLED
+            self._append_event({'type': 'run_cancelled', 'run_id': run_id})
+            cancelled = True
         
         if cancelled:
-            logger.info(f"Cancelled all runs for pipeline {pipeline_id}")
-            self._save_data()
+            logger.info("Cancelled all runs for pipeline %s", pipeline_id)
             
         return cancelled
 
-    def get_pipeline_status(self, pipeline_id: str) -> Optional[Dict[str, Any]]:
-        """Get pipeline definition status"""
+    def get_pipeline_status(self, pipeline_id: str, with_steps: bool = True) -> Optional[Dict[str, Any]]:
+        """Get pipeline definition status; with_steps=False leaves out the latest run's steps"""
         if pipeline_id in self.pipelines:
             pipeline = self.pipelines[pipeline_id]
             
             # Get latest run status for this pipeline
-            latest_run = None
-            for run in self.runs.values():
-                if run.pipeline_id == pipeline_id:
-                    if latest_run is None or run.created_at > latest_run.created_at:
-                        latest_run = run
+            latest_run_id = self._latest_active_run(pipeline_id)
+            latest_run = self.runs.summary(latest_run_id, with_steps=with_steps) if latest_run_id else None
             
             # Check run history for latest completed run if no active run
             if latest_run is None:
-                for run in sorted(self.run_history, key=lambda x: x.get('created_at', ''), reverse=True):
-                    if run.get('pipeline_id') == pipeline_id:
-                        return {
-                            'id': pipeline['id'],
-                            'name': pipeline['name'],
-                            'description': pipeline.get('description', ''),
-                            'status': run.get('status', 'unknown'),
-                            'created_at': pipeline['created_at'],
-                            'last_run_at': run.get('started_at'),
-                            'last_finished_at': run.get('finished_at'),
-                            'total_duration': run.get('total_duration'),
-                            'steps': run.get('steps', [])
-                        }
+                run = self._latest_history_run(pipeline_id)
+                if run is not None:
+                    result = {
+                        'id': pipeline['id'],
+                        'name': pipeline['name'],
+                        'description': pipeline.get('description', ''),
+                        'status': run.get('status', 'unknown'),
+                        'created_at': pipeline['created_at'],
+                        'last_run_at': run.get('started_at'),
+                        'last_finished_at': run.get('finished_at'),
+                        'total_duration': run.get('total_duration')
+                    }
+                    if with_steps:
+                        result['steps'] = run.get('steps', [])
+                    return result
             
             # Return pipeline definition with latest run info
             if latest_run:
-                return {
+                result = {
                     'id': pipeline['id'],
                     'name': pipeline['name'],
                     'description': pipeline.get('description', ''),
-                    'status': latest_run.status.value,
+                    'status': latest_run['status'],
                     'created_at': pipeline['created_at'],
-                    'last_run_at': latest_run.started_at,
-                    'last_finished_at': latest_run.finished_at,
-                    'total_duration': latest_run.total_duration,
-                    'steps': [step.to_dict() for step in latest_run.steps]
+                    'last_run_at': latest_run['started_at'],
+                    'last_finished_at': latest_run['finished_at'],
+                    'total_duration': latest_run['total_duration']
                 }
+                if with_steps:
+                    result['steps'] = latest_run['steps']
+                return result
             else:
                 # Pipeline exists but never run
-                return {
+                result = {
                     'id': pipeline['id'],
                     'name': pipeline['name'],
                     'description': pipeline.get('description', ''),
@@ -581,12 +1045,29 @@ class CICDAgent:
                     'created_at': pipeline['created_at'],
                     'last_run_at': None,
                     'last_finished_at': None,
-                    'total_duration': None,
-                    'steps': []
+                    'total_duration': None
                 }
+                if with_steps:
+                    result['steps'] = []
+                return result
         
         return None
 
+    def _latest_active_run(self, pipeline_id: str) -> Optional[str]:
+        """ID of the most recently created active run of a pipeline"""
+        run_ids = self._runs_by_pipeline.get(pipeline_id)
+        if not run_ids:
+            return None
+        return max(run_ids, key=lambda run_id: self.runs.peek(run_id, 'created_at'))
+    
+    def _latest_history_run(self, pipeline_id: str) -> Optional[Dict[str, Any]]:
+        """Most recently created finished run of a pipeline"""
+        run_ids = self._history_by_pipeline.get(pipeline_id)
+        if not run_ids:
+            return None
+        # Kept sorted by created_at, so the last one is the newest
+        return self.run_history[run_ids[-1]]
+
     def list_pipelines(self) -> List[Dict[str, Any]]:
         """List all pipeline definitions"""
         all_pipelines = []
@@ -594,21 +1075,18 @@ class CICDAgent:
         for pipeline in self.pipelines.values():
             latest_run_status = 'never_run'
             latest_run_time = None
-            active_runs = 0
-            
-            for run in self.runs.values():
-                if run.pipeline_id == pipeline['id']:
-                    active_runs += 1
-                    latest_run_status = run.status.value
-                    if latest_run_time is None or run.created_at > latest_run_time:
-                        latest_run_time = run.created_at
+            active_runs = len(self._runs_by_pipeline.get(pipeline['id'], ()))
             
-            if active_runs == 0:
-                for run in sorted(self.run_history, key=lambda x: x.get('created_at', ''), reverse=True):
-                    if run.get('pipeline_id') == pipeline['id']:
-                        latest_run_status = run.get('status', 'unknown')
-                        latest_run_time = run.get('created_at')
-                        break
+            latest_run_id = self._latest_active_run(pipeline['id'])
+            if latest_run_id is not None:
+                # Two fields are needed; read them directly instead of building a summary dict
+                latest_run_status = self.runs.status(latest_run_id)
+                latest_run_time = self.runs.peek(latest_run_id, 'created_at')
+            else:
+                run = self._latest_history_run(pipeline['id'])
+                if run is not None:
+                    latest_run_status = run.get('status', 'unknown')
+                    latest_run_time = run.get('created_at')
             
             all_pipelines.append({
                 'id': pipeline['id'],
@@ -618,7 +1096,7 @@ class CICDAgent:
                 'created_at': pipeline['created_at'],
                 'last_run_at': latest_run_time,
                 'active_runs': active_runs,
-                'total_runs': len([r for r in self.run_history if r.get('pipeline_id') == pipeline['id']]) + active_runs
+                'total_runs': len(self._history_by_pipeline.get(pipeline['id'], ())) + active_runs
             })
         
         return sorted(all_pipelines, key=lambda x: x['created_at'], reverse=True)
@@ -627,22 +1105,19 @@ class CICDAgent:
         """List all runs, optionally filtered by pipeline ID"""
         all_runs = []
         
-        for run in self.runs.values():
-            if pipeline_id is None or run.pipeline_id == pipeline_id:
-                all_runs.append(run.to_summary_dict())
-        
-        for run in self.run_history:
-            if pipeline_id is None or run['pipeline_id'] == pipeline_id:
-                all_runs.append({
-                    'id': run['id'],
-                    'pipeline_id': run['pipeline_id'],
-                    'name': run['name'],
-                    'status': self._get_status_value(run['status']),
-                    'created_at': run['created_at'],
-                    'started_at': run['started_at'],
-                    'finished_at': run['finished_at'],
-                    'total_duration': run.get('total_duration')
-                })
+        if pipeline_id is None:
+            active_run_ids = self.runs
+            history_runs = self.run_history.values()
+        else:
+            active_run_ids = self._runs_by_pipeline.get(pipeline_id, ())
+            history_runs = [self.run_history[run_id] for run_id in self._history_by_pipeline.get(pipeline_id, ())]
+        
+        for run_id in active_run_ids:
+            all_runs.append(self.runs.summary(run_id))
+        
+        # History statuses are stored as plain strings, so finished runs share the raw summary shape
+        for run in history_runs:
+            all_runs.append({key: run.get(key) for key in _RUN_SUMMARY_FIELDS})
         
         return sorted(all_runs, key=lambda x: x['created_at'], reverse=True)
     
@@ -650,33 +1125,14 @@ class CICDAgent:
         """Get run status and details"""
         # Check active runs
         if run_id in self.runs:
-            run = self.runs[run_id]
-            return {
-                'id': run.id,
-                'pipeline_id': run.pipeline_id,
-                'name': run.name,
-                'status': run.status.value,
-                'created_at': run.created_at,
-                'started_at': run.started_at,
-                'finished_at': run.finished_at,
-                'total_duration': run.total_duration,
-                'steps': [step.to_dict() for step in run.steps]
-            }
+            return self.runs.summary(run_id, with_steps=True)
         
         # Check history
-        for hist_run in self.run_history:
-            if hist_run['id'] == run_id:
-                return {
-                    'id': hist_run['id'],
-                    'pipeline_id': hist_run['pipeline_id'],
-                    'name': hist_run['name'],
-                    'status': self._get_status_value(hist_run['status']),
-                    'created_at': hist_run['created_at'],
-                    'started_at': hist_run['started_at'],
-                    'finished_at': hist_run['finished_at'],
-                    'total_duration': hist_run.get('total_duration'),
-                    'steps': hist_run.get('steps', [])
-                }
+        hist_run = self.run_history.get(run_id)
+        if hist_run is not None:
+            result = {key: hist_run.get(key) for key in _RUN_SUMMARY_FIELDS}
+            result['steps'] = hist_run.get('steps', [])
+            return result
         
         return None
 
@@ -686,42 +1142,40 @@ class CICDAgent:
         if run_id in self.runs:
             run = self.runs[run_id]
             if run.status == PipelineStatus.RUNNING:
-                logger.error(f"Cannot delete run {run_id}: currently running")
+                logger.error("Cannot delete run %s: currently running", run_id)
                 return False
             
-            del self.runs[run_id]
-            self._save_data()
-            logger.info(f"Deleted active run {run_id}")
+            self._remove_run(run_id)
+            self._append_event({'type': 'run_deleted', 'run_id': run_id})
+            logger.info("Deleted active run %s", run_id)
             return True
         
         # Check if run is in history
-        for i, hist_run in enumerate(self.run_history):
-            if hist_run['id'] == run_id:
-                del self.run_history[i]
-                self._save_data()
-                logger.info(f"Deleted historical run {run_id}")
-                return True
-        
-        logger.error(f"Run {run_id} not found")
+        if self._remove_history_run(run_id):
+            self._append_event({'type': 'run_deleted', 'run_id': run_id})
+            logger.info("Deleted historical run %s", run_id)
+            return True
+        
+        logger.error("Run %s not found", run_id)
         return False
 
     def delete_pipeline(self, pipeline_id: str) -> bool:
         """Delete a pipeline definition by ID"""
-        active_runs = [run_id for run_id, run in self.runs.items() 
-                      if run.pipeline_id == pipeline_id and run.status == PipelineStatus.RUNNING]
+        active_runs = [run_id for run_id in self._runs_by_pipeline.get(pipeline_id, ())
+                       if self.runs.status(run_id) == PipelineStatus.RUNNING.value]
         
         if active_runs:
-            logger.error(f"Cannot delete pipeline {pipeline_id}: has active runs {active_runs}")
+            logger.error("Cannot delete pipeline %s: has active runs %s", pipeline_id, active_runs)
             return False
         
         if pipeline_id in self.pipelines:
             pipeline_name = self.pipelines[pipeline_id]['name']
             del self.pipelines[pipeline_id]
-            self._save_data()
-            logger.info(f"Deleted pipeline definition {pipeline_name} with ID {pipeline_id}")
+            self._append_event({'type': 'pipeline_deleted', 'pipeline_id': pipeline_id})
+            logger.info("Deleted pipeline definition %s with ID %s", pipeline_name, pipeline_id)
             return True
         
-        logger.warning(f"Pipeline {pipeline_id} not found")
+        logger.warning("Pipeline %s not found", pipeline_id)
         return False
 
 agent = CICDAgent() 
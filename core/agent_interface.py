@@ -2,176 +2,275 @@
 """
 Agent Interface Script
 Provides a command-line interface for the CI/CD agent that can be called from Next.js API routes.
+
+Usage: agent_interface.py <command> [json_args]
+       agent_interface.py --daemon   (one {"command": ..., "args": ...} JSON object per stdin line,
+                                      one JSON response per stdout line)
 """
 
 import sys
-import json
-import traceback
+import time
+import functools
 import logging
 
-for handler in logging.root.handlers[:]:
-    logging.root.removeHandler(handler)
+import jsonutil
+
+if __name__ == '__main__':
+    # Configure before importing the agent; stdout carries the JSON response, so only errors go to stderr
+    logging.basicConfig(
+        level=logging.ERROR,
+        stream=sys.stderr,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        force=True
+    )
+
+logger = logging.getLogger(__name__)
 
-logging.basicConfig(
-    level=logging.ERROR,  
-    stream=sys.stderr,    
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+@functools.lru_cache(maxsize=1)
+def get_agent():
+    """Import and load the agent on first use, so health checks never pay for it"""
+    from agent import agent
+    return agent
 
-logging.getLogger().handlers.clear()
-logging.getLogger().setLevel(logging.ERROR)
+# Validation errors are returned as shared, never-mutated dicts
+ERROR_PIPELINE_CONFIG_REQUIRED = {'success': False, 'error': 'pipeline_config required'}
+ERROR_PIPELINE_ID_REQUIRED = {'success': False, 'error': 'pipeline_id required'}
+ERROR_PIPELINE_IDS_REQUIRED = {'success': False, 'error': 'pipeline_ids required'}
+ERROR_RUN_ID_REQUIRED = {'success': False, 'error': 'run_id required'}
+ERROR_PIPELINE_NOT_FOUND = {'success': False, 'error': 'Pipeline not found'}
+ERROR_RUN_NOT_FOUND = {'success': False, 'error': 'Run not found'}
 
-stderr_handler = logging.StreamHandler(sys.stderr)
-stderr_handler.setLevel(logging.ERROR)
-logging.getLogger().addHandler(stderr_handler)
+def _list_pipelines(args):
+    return {'success': True, 'data': get_agent().list_pipelines()}
 
-logger = logging.getLogger(__name__)
+def _create_pipeline(args):
+    pipeline_config = args.get('pipeline_config')
+    if not pipeline_config:
+        return ERROR_PIPELINE_CONFIG_REQUIRED
+    pipeline_id = get_agent().create_pipeline(pipeline_config)
+    return {'success': True, 'data': {'pipeline_id': pipeline_id, 'status': 'created'}}
+
+def _create_and_run_pipeline(args):
+    pipeline_config = args.get('pipeline_config')
+    if not pipeline_config:
+        return ERROR_PIPELINE_CONFIG_REQUIRED
+    agent = get_agent()
+    pipeline_id = agent.create_pipeline(pipeline_config)
+    # Create and run as one operation: a pipeline whose run could not start is removed again
+    try:
+        run_id = agent.run_pipeline(pipeline_id, background=True)
+    except Exception:
+        agent.delete_pipeline(pipeline_id)
+        raise
+    if not run_id:
+        agent.delete_pipeline(pipeline_id)
+        return {'success': False, 'error': 'Failed to start pipeline'}
+    return {'success': True, 'data': {'pipeline_id': pipeline_id, 'run_id': run_id, 'status': 'running'}}
+
+def _get_pipeline(args):
+    pipeline_id = args.get('pipeline_id')
+    if not pipeline_id:
+        return ERROR_PIPELINE_ID_REQUIRED
+    result = get_agent().get_pipeline_status(pipeline_id)
+    if result:
+        return {'success': True, 'data': result}
+    else:
+        return ERROR_PIPELINE_NOT_FOUND
+
+def _get_pipeline_status(args):
+    pipeline_id = args.get('pipeline_id')
+    if not pipeline_id:
+        return ERROR_PIPELINE_ID_REQUIRED
+    # Status fields only: pollers should not pay for the step output on every check
+    result = get_agent().get_pipeline_status(pipeline_id, with_steps=False)
+    if result:
+        return {'success': True, 'data': result}
+    else:
+        return ERROR_PIPELINE_NOT_FOUND
+
+def _get_pipelines(args):
+    pipeline_ids = args.get('pipeline_ids')
+    if not isinstance(pipeline_ids, list):
+        return ERROR_PIPELINE_IDS_REQUIRED
+    # Details in the order asked for; null where a pipeline does not exist
+    agent = get_agent()
+    return {'success': True, 'data': [agent.get_pipeline_status(pipeline_id) for pipeline_id in pipeline_ids]}
 
-from agent import agent
+def _run_pipeline(args):
+    pipeline_id = args.get('pipeline_id')
+    background = args.get('background', True)
+    if not pipeline_id:
+        return ERROR_PIPELINE_ID_REQUIRED
+    run_id = get_agent().run_pipeline(pipeline_id, background=background)
+    if run_id:
+        return {'success': True, 'data': {'run_id': run_id, 'status': 'running' if background else 'completed'}}
+    else:
+        return {'success': False, 'error': 'Failed to start pipeline'}
+
+def _cancel_pipeline(args):
+    pipeline_id = args.get('pipeline_id')
+    if not pipeline_id:
+        return ERROR_PIPELINE_ID_REQUIRED
+    if get_agent().cancel_pipeline(pipeline_id):
+        return {'success': True, 'data': {'status': 'cancelled'}}
+    else:
+        return {'success': False, 'error': 'Pipeline not found or not running'}
+
+def _delete_pipeline(args):
+    pipeline_id = args.get('pipeline_id')
+    if not pipeline_id:
+        return ERROR_PIPELINE_ID_REQUIRED
+    if get_agent().delete_pipeline(pipeline_id):
+        return {'success': True, 'data': {'status': 'deleted'}}
+    else:
+        return {'success': False, 'error': 'Pipeline not found or cannot be deleted'}
+
+def _list_runs(args):
+    return {'success': True, 'data': get_agent().list_runs(args.get('pipeline_id'))}
+
+def _overview(args):
+    agent = get_agent()
+    return {'success': True, 'data': {'pipelines': agent.list_pipelines(), 'runs': agent.list_runs()}}
+
+def _get_run(args):
+    run_id = args.get('run_id')
+    if not run_id:
+        return ERROR_RUN_ID_REQUIRED
+    result = get_agent().get_run_status(run_id)
+    if result:
+        return {'success': True, 'data': result}
+    else:
+        return ERROR_RUN_NOT_FOUND
+
+def _cancel_run(args):
+    run_id = args.get('run_id')
+    if not run_id:
+        return ERROR_RUN_ID_REQUIRED
+    if get_agent().cancel_run(run_id):
+        return {'success': True, 'data': {'status': 'cancelled'}}
+    else:
+        return {'success': False, 'error': 'Run not found or not running'}
+
+def _delete_run(args):
+    run_id = args.get('run_id')
+    if not run_id:
+        return ERROR_RUN_ID_REQUIRED
+    if get_agent().delete_run(run_id):
+        return {'success': True, 'data': {'status': 'deleted'}}
+    else:
+        return {'success': False, 'error': 'Run not found or currently running'}
+
+def _execute_run(args):
+    run_id = args.get('run_id')
+    if not run_id:
+        return ERROR_RUN_ID_REQUIRED
+    if get_agent()._execute_run(run_id):
+        return {'success': True, 'data': {'status': 'completed'}}
+    else:
+        return {'success': False, 'error': 'Execution failed'}
+
+def _health_check(args):
+    return {
+        'success': True, 
+        'data': {
+            'status': 'healthy',
+            'timestamp': str(time.time()),
+            'agent_status': 'running'
+        }
+    }
+
+# Command name -> handler; each handler takes the (possibly empty) args dict
+COMMANDS = {
+    'list_pipelines': _list_pipelines,
+    'create_pipeline': _create_pipeline,
+    'create_and_run_pipeline': _create_and_run_pipeline,
+    'get_pipeline': _get_pipeline,
+    'get_pipeline_status': _get_pipeline_status,
+    'get_pipelines': _get_pipelines,
+    'run_pipeline': _run_pipeline,
+    'cancel_pipeline': _cancel_pipeline,
+    'delete_pipeline': _delete_pipeline,
+    'list_runs': _list_runs,
+    'overview': _overview,
+    'get_run': _get_run,
+    'cancel_run': _cancel_run,
+    'delete_run': _delete_run,
+    'execute_run': _execute_run,
+    'health_check': _health_check,
+}
 
 def handle_command(command, args=None):
     """Handle agent commands and return JSON responses"""
-    try:
-        if command == 'list_pipelines':
-            result = agent.list_pipelines()
-            return {'success': True, 'data': result}
-        
-        elif command == 'create_pipeline':
-            pipeline_config = args.get('pipeline_config') if args else None
-            if not pipeline_config:
-                return {'success': False, 'error': 'pipeline_config required'}
-            pipeline_id = agent.create_pipeline(pipeline_config)
-            return {'success': True, 'data': {'pipeline_id': pipeline_id, 'status': 'created'}}
-        
-        elif command == 'create_and_run_pipeline':
-            pipeline_config = args.get('pipeline_config') if args else None
-            if not pipeline_config:
-                return {'success': False, 'error': 'pipeline_config required'}
-            pipeline_id = agent.create_pipeline(pipeline_config)
-            run_id = agent.run_pipeline(pipeline_id, background=True)
-            return {'success': True, 'data': {'pipeline_id': pipeline_id, 'run_id': run_id, 'status': 'running'}}
-        
-        elif command == 'get_pipeline':
-            pipeline_id = args.get('pipeline_id')
-            if not pipeline_id:
-                return {'success': False, 'error': 'pipeline_id required'}
-            result = agent.get_pipeline_status(pipeline_id)
-            if result:
-                return {'success': True, 'data': result}
-            else:
-                return {'success': False, 'error': 'Pipeline not found'}
-        
-        elif command == 'run_pipeline':
-            pipeline_id = args.get('pipeline_id')
-            background = args.get('background', True)
-            if not pipeline_id:
-                return {'success': False, 'error': 'pipeline_id required'}
-            run_id = agent.run_pipeline(pipeline_id, background=background)
-            if run_id:
-                return {'success': True, 'data': {'run_id': run_id, 'status': 'running' if background else 'completed'}}
-            else:
-                return {'success': False, 'error': 'Failed to start pipeline'}
-        
-        elif command == 'cancel_pipeline':
-            pipeline_id = args.get('pipeline_id')
-            if not pipeline_id:
-                return {'success': False, 'error': 'pipeline_id required'}
-            success = agent.cancel_pipeline(pipeline_id)
-            if success:
-                return {'success': True, 'data': {'status': 'cancelled'}}
-            else:
-                return {'success': False, 'error': 'Pipeline not found or not running'}
-        
-        elif command == 'delete_pipeline':
-            pipeline_id = args.get('pipeline_id')
-            if not pipeline_id:
-                return {'success': False, 'error': 'pipeline_id required'}
-            success = agent.delete_pipeline(pipeline_id)
-            if success:
-                return {'success': True, 'data': {'status': 'deleted'}}
-            else:
-                return {'success': False, 'error': 'Pipeline not found or cannot be deleted'}
-        
-        elif command == 'list_runs':
-            pipeline_id = args.get('pipeline_id') if args else None
-            result = agent.list_runs(pipeline_id)
-            return {'success': True, 'data': result}
-        
-        elif command == 'get_run':
-            run_id = args.get('run_id')
-            if not run_id:
-                return {'success': False, 'error': 'run_id required'}
-            result = agent.get_run_status(run_id)
-            if result:
-                return {'success': True, 'data': result}
-            else:
-                return {'success': False, 'error': 'Run not found'}
-        
-        elif command == 'cancel_run':
-            run_id = args.get('run_id')
-            if not run_id:
-                return {'success': False, 'error': 'run_id required'}
-            success = agent.cancel_run(run_id)
-            if success:
-                return {'success': True, 'data': {'status': 'cancelled'}}
-            else:
-                return {'success': False, 'error': 'Run not found or not running'}
-        
-        elif command == 'delete_run':
-            run_id = args.get('run_id')
-            if not run_id:
-                return {'success': False, 'error': 'run_id required'}
-            success = agent.delete_run(run_id)
-            if success:
-                return {'success': True, 'data': {'status': 'deleted'}}
-            else:
-                return {'success': False, 'error': 'Run not found or currently running'}
-        
-        elif command == 'execute_run':
-            run_id = args.get('run_id')
-            if not run_id:
-                return {'success': False, 'error': 'run_id required'}
-            success = agent._execute_run(run_id)
-            if success:
-                return {'success': True, 'data': {'status': 'completed'}}
-            else:
-                return {'success': False, 'error': 'Execution failed'}
-        
-        elif command == 'health_check':
-            return {
-                'success': True, 
-                'data': {
-                    'status': 'healthy',
-                    'timestamp': str(time.time()),
-                    'agent_status': 'running'
-                }
-            }
-        
-        else:
-            return {'success': False, 'error': f'Unknown command: {command}'}
+    handler = COMMANDS.get(command)
+    if handler is None:
+        return {'success': False, 'error': f'Unknown command: {command}'}
     
+    try:
+        return handler(args or {})
     except Exception as e:
-        logger.error(f"Error executing command {command}: {str(e)}")
-        logger.error(traceback.format_exc())
+        # Traceback formatting is left to the logging handler, so it only happens when emitted
+        logger.exception("Error executing command %s", command)
         return {'success': False, 'error': str(e)}
 
+def write_response(result):
+    """Write a response as a single line of JSON to stdout"""
+    sys.stdout.buffer.write(jsonutil.dumps(result) + b'\n')
+    sys.stdout.flush()
+
+def run_command(command, args=None):
+    """Handle a command in a long-lived process, staying in sync with other agent processes"""
+    # Other processes (detached runs, other callers) may have changed state since the
+    # last command; an agent that is not loaded yet will read it fresh anyway
+    agent_loaded = get_agent.cache_info().currsize > 0
+    if agent_loaded:
+        get_agent().refresh()
+    result = handle_command(command, args)
+    if agent_loaded or get_agent.cache_info().currsize > 0:
+        get_agent()._flush()
+    return result
+
+def serve():
+    """Answer newline-delimited JSON commands from stdin until it is closed"""
+    for line in sys.stdin.buffer:
+        if not line.strip():
+            continue
+        try:
+            request = jsonutil.loads(line)
+            command = request['command']
+            args = request.get('args')
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            write_response({'success': False, 'error': f'Invalid request: {str(e)}'})
+            continue
+        
+        try:
+            result = run_command(command, args)
+        except Exception as e:
+            logger.error("Daemon failed on command %s: %s", command, e)
+            result = {'success': False, 'error': str(e)}
+        write_response(result)
+
 def main():
     """Main entry point"""
     if len(sys.argv) < 2:
-        return json.dumps({'success': False, 'error': 'Command required'})
+        write_response({'success': False, 'error': 'Command required'})
+        return
+    
+    if sys.argv[1] == '--daemon':
+        serve()
+        return
     
     command = sys.argv[1]
     args = None
     
     if len(sys.argv) > 2:
         try:
-            args = json.loads(sys.argv[2])
-        except json.JSONDecodeError as e:
-            return json.dumps({'success': False, 'error': f'Invalid JSON arguments: {str(e)}'})
+            args = jsonutil.loads(sys.argv[2])
+        except ValueError as e:
+            write_response({'success': False, 'error': f'Invalid JSON arguments: {str(e)}'})
+            return
     
     result = handle_command(command, args)
-    print(json.dumps(result))
+    write_response(result)
 
 if __name__ == '__main__':
-    import time
     main() 
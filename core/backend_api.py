@@ -2,183 +2,552 @@
 """
 HTTP API wrapper for the agent interface.
 Provides REST endpoints for the CI/CD pipeline agent.
+
+Commands run in-process by default. AGENT_TRANSPORT=daemon sends them to a pool of
+long-lived `agent_interface.py --daemon` processes, and AGENT_TRANSPORT=subprocess runs
+each one in a fresh `agent_interface.py` process.
 """
-import json
 import logging
+import queue
+import select
 import subprocess
-from flask import Flask, request, jsonify
+import sys
+import threading
+import time
+from collections import OrderedDict
+from flask import Flask, request
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+from werkzeug.exceptions import HTTPException
 import os
 from http import HTTPStatus
 
-logging.basicConfig(level=logging.INFO)
+import agent_interface
+import jsonutil
+import storage_paths
+
+# LOGLEVEL=WARNING (or higher) silences per-request logging in production
+logging.basicConfig(level=os.environ.get('LOGLEVEL', 'INFO').upper())
 logger = logging.getLogger(__name__)
 
+class JsonUtilProvider(JSONProvider):
+    """Flask JSON provider backed by jsonutil, so jsonify and get_json use orjson too"""
+
+    def dumps(self, obj, **kwargs):
+        return jsonutil.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return jsonutil.loads(s)
+
 app = Flask(__name__)
-CORS(app)
+app.json = JsonUtilProvider(app)
+# Pipeline configs are small; refuse oversized bodies before reading or parsing them
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_REQUEST_BYTES', 1024 * 1024))
+# Accept /runs/ as well as /runs without Werkzeug's redirect round trip
+app.url_map.strict_slashes = False
+# Only the API resources need CORS; browsers may cache preflight answers for a day
+CORS(
+    app,
+    resources={r'/(pipelines|runs|overview|events)(/.*)?': {'origins': os.environ.get('ALLOWED_ORIGIN', '*')}},
+    max_age=86400
+)
 
-def execute_agent_command(command, **kwargs):
-    """Execute agent interface command and return JSON response."""
+# Encoded GET responses by request key, valid for as long as the agent state version is unchanged
+RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', '256'))
+_response_cache = OrderedDict()  # key -> (state version, body), least recently used first
+_response_cache_lock = threading.Lock()
+
+# Resolved once; the subprocess transport runs agent_interface.py with this interpreter
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+AGENT_INTERFACE_ARGV = (sys.executable, os.path.join(BASE_DIR, 'agent_interface.py'))
+
+# 'inprocess' calls agent_interface directly, 'daemon' uses a pool of agent_interface.py --daemon
+# processes, 'subprocess' spawns agent_interface.py per command
+AGENT_TRANSPORT = os.environ.get('AGENT_TRANSPORT', 'inprocess')
+AGENT_POOL_SIZE = int(os.environ.get('AGENT_POOL_SIZE', '2'))
+AGENT_TIMEOUT = 30
+# The agent is not thread-safe; commands in one worker process take turns
+_agent_lock = threading.Lock()
+
+# The default agent's state files. Every change made by any agent process touches one of
+# them, so their stat identifies the current state.
+STATE_FILES = storage_paths.state_files(storage_paths.default_data_file())
+
+# How often /events checks for changes, and how often it sends a keepalive when nothing changed
+EVENTS_POLL_INTERVAL = float(os.environ.get('EVENTS_POLL_INTERVAL', '1.0'))
+EVENTS_KEEPALIVE = 15.0
+# Each open stream holds a worker thread; beyond this many, clients are told to fall back to polling
+EVENTS_MAX_STREAMS = int(os.environ.get('EVENTS_MAX_STREAMS', '4'))
+_event_streams = threading.BoundedSemaphore(EVENTS_MAX_STREAMS)
+
+# One watcher thread per worker process stats the state files and wakes every open stream
+_state_changed = threading.Condition()
+_watched_version = None
+_watcher_started = False
+
+# How long POST /pipelines/<id>/run with {"background": false} waits before answering 202
+SYNC_RUN_TIMEOUT = float(os.environ.get('SYNC_RUN_TIMEOUT', '25'))
+SYNC_RUN_POLL_INTERVAL = 0.25
+
+# Fixed error bodies, encoded once at import
+ERROR_NO_JSON = jsonutil.dumps({'error': 'No JSON data provided'})
+ERROR_NOT_FOUND = jsonutil.dumps({'error': 'Endpoint not found'})
+ERROR_BATCH_IDS = jsonutil.dumps({'error': "'ids' must be a list of pipeline IDs"})
+ERROR_TOO_LARGE = jsonutil.dumps({'error': 'Request body too large'})
+ERROR_TOO_MANY_STREAMS = jsonutil.dumps({'error': 'Too many event streams'})
+ERROR_AGENT_TIMEOUT = jsonutil.dumps({'error': 'Command timed out'})
+ERROR_AGENT_INVALID_JSON = jsonutil.dumps({'error': 'Invalid JSON response from agent'})
+ERROR_INTERNAL = jsonutil.dumps({'error': 'Internal server error'})
+# Same shape as the agent's health_check command; only the timestamp is filled in per request
+# (kept a string, as clients decode it into a string field)
+HEALTH_TEMPLATE = b'{"success":true,"data":{"status":"healthy","timestamp":"%.3f","agent_status":"running"}}'
+
+def state_version():
+    """Cheap token that changes whenever the persisted agent state changes"""
+    parts = []
+    for path in STATE_FILES:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            parts.append('-')
+            continue
+        parts.append(f'{st.st_ino:x}.{st.st_mtime_ns:x}.{st.st_size:x}')
+    return '-'.join(parts)
+
+def _watch_state():
+    """Publish state version changes to the waiting event streams"""
+    global _watched_version
+    while True:
+        version = state_version()
+        if version != _watched_version:
+            with _state_changed:
+                _watched_version = version
+                _state_changed.notify_all()
+        time.sleep(EVENTS_POLL_INTERVAL)
+
+def _ensure_state_watcher():
+    """Start the watcher thread on first use (after gunicorn has forked the worker)"""
+    global _watcher_started
+    with _state_changed:
+        if _watcher_started:
+            return
+        _watcher_started = True
+    threading.Thread(target=_watch_state, name='state-watcher', daemon=True).start()
+
+def _execute_agent_inprocess(command, kwargs):
+    """Run an agent command in this process and return the decoded response."""
+    try:
+        with _agent_lock:
+            return agent_interface.run_command(command, kwargs), HTTPStatus.OK
+    except Exception as e:
+        logger.error("Unexpected error: %s", e)
+        return {'error': str(e)}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+def _execute_agent_subprocess(command, kwargs):
+    """Run an agent command in a new agent_interface.py process and return its encoded response."""
     try:
-        cmd = ['python', 'agent_interface.py', command]
+        cmd = [*AGENT_INTERFACE_ARGV, command]
         
         if kwargs:
-            cmd.append(json.dumps(kwargs))
+            cmd.append(jsonutil.dumps(kwargs).decode())
         
         result = subprocess.run(
             cmd,
             capture_output=True,
-            text=True,
-            timeout=30,
-            cwd=os.path.dirname(os.path.abspath(__file__))
+            timeout=AGENT_TIMEOUT,
+            cwd=BASE_DIR
         )
         
         if result.returncode != 0:
-            logger.error(f"Command failed: {result.stderr}")
-            return {'error': result.stderr}, HTTPStatus.INTERNAL_SERVER_ERROR
+            stderr = result.stderr.decode(errors='replace')
+            logger.error("Command failed: %s", stderr)
+            return jsonutil.dumps({'error': stderr}), HTTPStatus.INTERNAL_SERVER_ERROR
+        
+        # The agent writes its response as the last line of stdout; pass it through
+        # as-is instead of decoding and re-encoding the whole document. Only the last
+        # line is sliced out, so large listings are not copied
+        stdout = result.stdout
+        body = stdout[stdout.rfind(b'\n', 0, len(stdout) - 1) + 1:].rstrip()
+        if body.startswith(b'{') and body.endswith(b'}'):
+            return body, HTTPStatus.OK
         
         # Parse JSON response - extract only JSON part from output (if agent by any change produce additional stdout)
         try:
-            stdout = result.stdout.strip()
-            
-            # Find the JSON object by looking for balanced braces
-            json_start = stdout.find('{')
-            if json_start != -1:
-                brace_count = 0
-                json_end = json_start
-                
-                for i in range(json_start, len(stdout)):
-                    if stdout[i] == '{':
-                        brace_count += 1
-                    elif stdout[i] == '}':
-                        brace_count -= 1
-                        if brace_count == 0:
-                            json_end = i + 1
-                            break
-                
-                if brace_count == 0:
-                    json_part = stdout[json_start:json_end]
-                    return json.loads(json_part), HTTPStatus.OK
+            try:
+                # A response spread over several lines still parses straight from the bytes
+                response = jsonutil.loads(stdout)
+            except ValueError:
+                response = jsonutil.loads_first_object(stdout.decode(errors='replace'))
+            return jsonutil.dumps(response), HTTPStatus.OK
             
-            # If extraction fails, try to parse the entire stdout
-            return json.loads(stdout), HTTPStatus.OK
-                
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON response: {e}")
-            logger.error(f"Raw stdout (first 200 chars): {repr(result.stdout[:200])}")
-            return {'error': 'Invalid JSON response from agent'}, HTTPStatus.INTERNAL_SERVER_ERROR
+        except ValueError as e:
+            logger.error("Failed to parse JSON response: %s", e)
+            logger.error("Raw stdout (first 200 chars): %r", result.stdout[:200])
+            return ERROR_AGENT_INVALID_JSON, HTTPStatus.INTERNAL_SERVER_ERROR
             
     except subprocess.TimeoutExpired:
         logger.error("Command timed out")
-        return {'error': 'Command timed out'}, HTTPStatus.INTERNAL_SERVER_ERROR
+        return ERROR_AGENT_TIMEOUT, HTTPStatus.INTERNAL_SERVER_ERROR
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
-        return {'error': str(e)}, HTTPStatus.INTERNAL_SERVER_ERROR
+        logger.error("Unexpected error: %s", e)
+        return jsonutil.dumps({'error': str(e)}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+class AgentDaemonPool:
+    """Long-lived `agent_interface.py --daemon` processes, each serving one request at a time"""
+    
+    def __init__(self, size):
+        self._size = size
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._started = 0
+    
+    def _acquire(self):
+        """Take an idle daemon, starting a new one while the pool is below its size"""
+        while True:
+            with self._lock:
+                if self._idle.empty() and self._started < self._size:
+                    # Started on demand, so gunicorn workers each get their own after forking
+                    proc = subprocess.Popen([*AGENT_INTERFACE_ARGV, '--daemon'], cwd=BASE_DIR,
+                                            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+                    self._started += 1
+                    return proc
+            proc = self._idle.get(timeout=AGENT_TIMEOUT)
+            if proc.poll() is None:
+                return proc
+            # Died while idle; replace it rather than failing the request
+            self._discard(proc)
+    
+    def _discard(self, proc):
+        """Kill a daemon whose protocol state is unknown; a fresh one replaces it on demand"""
+        proc.kill()
+        proc.wait()
+        with self._lock:
+            self._started -= 1
+    
+    def call(self, command, kwargs):
+        """Send one command and return the encoded response line"""
+        proc = self._acquire()
+        try:
+            proc.stdin.write(jsonutil.dumps({'command': command, 'args': kwargs}) + b'\n')
+            proc.stdin.flush()
+            ready, _, _ = select.select([proc.stdout], [], [], AGENT_TIMEOUT)
+            if not ready:
+                raise subprocess.TimeoutExpired(command, AGENT_TIMEOUT)
+            line = proc.stdout.readline()
+            if not line:
+                raise RuntimeError(f"Agent daemon exited with code {proc.wait()}")
+        except BaseException:
+            self._discard(proc)
+            raise
+        self._idle.put(proc)
+        return line.rstrip(b'\n')
+
+_agent_pool = AgentDaemonPool(AGENT_POOL_SIZE)
+
+def _execute_agent_daemon(command, kwargs):
+    """Run an agent command on a pooled daemon process and return its encoded response."""
+    try:
+        return _agent_pool.call(command, kwargs), HTTPStatus.OK
+    except (subprocess.TimeoutExpired, queue.Empty):
+        logger.error("Command timed out")
+        return ERROR_AGENT_TIMEOUT, HTTPStatus.INTERNAL_SERVER_ERROR
+    except Exception as e:
+        logger.error("Unexpected error: %s", e)
+        return jsonutil.dumps({'error': str(e)}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+def execute_agent_command_raw(command, **kwargs):
+    """Execute agent interface command and return its encoded JSON response."""
+    if AGENT_TRANSPORT == 'subprocess':
+        return _execute_agent_subprocess(command, kwargs)
+    if AGENT_TRANSPORT == 'daemon':
+        return _execute_agent_daemon(command, kwargs)
+    response, status = _execute_agent_inprocess(command, kwargs)
+    return jsonutil.dumps(response), status
+
+def execute_agent_command(command, **kwargs):
+    """Execute agent interface command and return the decoded JSON response."""
+    if AGENT_TRANSPORT == 'inprocess':
+        return _execute_agent_inprocess(command, kwargs)
+    body, status = execute_agent_command_raw(command, **kwargs)
+    return jsonutil.loads(body), status
+
+def json_response(data, status=HTTPStatus.OK):
+    """Build a JSON response, encoded with orjson when available"""
+    return bytes_response(jsonutil.dumps(data), status)
+
+def bytes_response(body, status=HTTPStatus.OK):
+    """Build a response from an already encoded JSON body"""
+    return app.response_class(body, status=status, mimetype='application/json')
+
+def conditional_response(body, etag):
+    """Successful GET response tagged with an ETag; answers 304 when the client already has it"""
+    response = bytes_response(body)
+    response.set_etag(etag)
+    # Pollers must revalidate every time, but unchanged state costs them no body
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+def not_modified(etag):
+    """304 response if the client's copy matches etag, otherwise None"""
+    # Weak comparison: the gateway's gzip turns the ETag into W/"..." on the way out
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    response = app.response_class(status=HTTPStatus.NOT_MODIFIED)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def cached_command_response(key, command, **kwargs):
+    """Run a read-only agent command, reusing its encoded response until the agent state changes"""
+    # Read the version before running the command, so a body is never tagged newer than it is
+    etag = state_version()
+    response = not_modified(etag)
+    if response is not None:
+        return response
+    
+    with _response_cache_lock:
+        hit = _response_cache.get(key)
+        if hit is not None:
+            _response_cache.move_to_end(key)
+    if hit is not None and hit[0] == etag:
+        return conditional_response(hit[1], etag)
+    
+    body, status = execute_agent_command_raw(command, **kwargs)
+    if status != HTTPStatus.OK:
+        return bytes_response(body, status)
+    
+    with _response_cache_lock:
+        _response_cache[key] = (etag, body)
+        _response_cache.move_to_end(key)
+        if len(_response_cache) > RESPONSE_CACHE_SIZE:
+            # Keys include client-supplied IDs, so keep the table bounded; drop stale versions
+            # first, then the least recently used entries
+            for stale_key in [k for k, v in _response_cache.items() if v[0] != etag]:
+                del _response_cache[stale_key]
+            while len(_response_cache) > RESPONSE_CACHE_SIZE:
+                _response_cache.popitem(last=False)
+    return conditional_response(body, etag)
+
+def request_json():
+    """Parse the request body as JSON, or return None if it is missing or invalid"""
+    # Read once, without keeping a copy; bodies over MAX_CONTENT_LENGTH are refused with 413 from
+    # their Content-Length before anything is read
+    try:
+        return jsonutil.loads(request.get_data(cache=False))
+    except ValueError:
+        return None
+
+def pipeline_config_error(config):
+    """Describe what is wrong with a pipeline definition, or return None if it can be created"""
+    if not isinstance(config, dict):
+        return 'Pipeline definition must be a JSON object'
+    if not isinstance(config.get('name'), str) or not config['name']:
+        return "Pipeline 'name' must be a non-empty string"
+    steps = config.get('steps')
+    if not isinstance(steps, list) or not all(isinstance(step, dict) for step in steps):
+        return "Pipeline 'steps' must be a list of objects"
+    return None
+
+# Endpoints that just forward their URL parameters to an agent command of the same name
+PROXY_ROUTES = [
+    ('/pipelines/<pipeline_id>', 'GET', 'get_pipeline'),
+    ('/pipelines/<pipeline_id>', 'DELETE', 'delete_pipeline'),
+    ('/pipelines/<pipeline_id>/status', 'GET', 'get_pipeline_status'),
+    ('/pipelines/<pipeline_id>/cancel', 'POST', 'cancel_pipeline'),
+    ('/runs/<run_id>', 'GET', 'get_run'),
+    ('/runs/<run_id>', 'DELETE', 'delete_run'),
+    ('/runs/<run_id>/cancel', 'POST', 'cancel_run'),
+]
+
+def make_proxy_view(command):
+    """Build a view that runs an agent command with the URL parameters as arguments"""
+    def view(**kwargs):
+        if request.method == 'GET':
+            return cached_command_response((command, *kwargs.values()), command, **kwargs)
+        body, status = execute_agent_command_raw(command, **kwargs)
+        return bytes_response(body, status)
+    view.__doc__ = f"Forward to the {command} agent command."
+    return view
+
+for rule, method, command in PROXY_ROUTES:
+    app.add_url_rule(rule, endpoint=command, view_func=make_proxy_view(command), methods=[method])
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
-    response, status = execute_agent_command('health_check')
-    return jsonify(response), status
+    # Answered in-process: load balancer probes should not spawn an agent process
+    return bytes_response(HEALTH_TEMPLATE % time.time())
+
+@app.route('/events', methods=['GET'])
+def events():
+    """Server-sent events stream announcing agent state changes."""
+    if not _event_streams.acquire(blocking=False):
+        # Keep threads free for ordinary requests; the dashboard polls when the stream fails
+        return bytes_response(ERROR_TOO_MANY_STREAMS, HTTPStatus.SERVICE_UNAVAILABLE)
+    _ensure_state_watcher()
+    
+    def stream():
+        try:
+            # Browsers reconnect after this many milliseconds if the stream drops
+            yield b'retry: 5000\n\n'
+            last_version = None
+            while True:
+                with _state_changed:
+                    _state_changed.wait_for(lambda: _watched_version not in (None, last_version),
+                                            timeout=EVENTS_KEEPALIVE)
+                    version = _watched_version
+                if version is not None and version != last_version:
+                    last_version = version
+                    yield b'data: {"version":"%s"}\n\n' % version.encode()
+                else:
+                    yield b': keepalive\n\n'
+        finally:
+            _event_streams.release()
+    
+    return app.response_class(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        # Tell nginx not to buffer the stream
+        'X-Accel-Buffering': 'no',
+    })
 
 @app.route('/pipelines', methods=['GET'])
 def list_pipelines():
     """List all pipelines."""
-    response, status = execute_agent_command('list_pipelines')
-    return jsonify(response), status
+    return cached_command_response('pipelines', 'list_pipelines')
 
 @app.route('/pipelines', methods=['POST'])
 def create_pipeline():
     """Create a new pipeline."""
-    data = request.get_json()
+    data = request_json()
     if not data:
-        return jsonify({'error': 'No JSON data provided'}), HTTPStatus.BAD_REQUEST
+        return bytes_response(ERROR_NO_JSON, HTTPStatus.BAD_REQUEST)
+    # Reject malformed definitions here rather than after a round trip to the agent
+    error = pipeline_config_error(data)
+    if error:
+        return json_response({'error': error}, HTTPStatus.BAD_REQUEST)
     
-    response, status = execute_agent_command('create_pipeline', pipeline_config=data)
-    return jsonify(response), status
+    body, status = execute_agent_command_raw('create_pipeline', pipeline_config=data)
+    return bytes_response(body, status)
 
-@app.route('/pipelines/<pipeline_id>', methods=['GET'])
-def get_pipeline(pipeline_id):
-    """Get a specific pipeline."""
-    response, status = execute_agent_command('get_pipeline', pipeline_id=pipeline_id)
-    return jsonify(response), status
+@app.route('/pipelines/batch', methods=['POST'])
+def get_pipelines_batch():
+    """Get the details of several pipelines, in the order of the IDs given, in one request."""
+    data = request_json()
+    if not data:
+        return bytes_response(ERROR_NO_JSON, HTTPStatus.BAD_REQUEST)
+    ids = data.get('ids') if isinstance(data, dict) else None
+    if not isinstance(ids, list) or not all(isinstance(pipeline_id, str) for pipeline_id in ids):
+        return bytes_response(ERROR_BATCH_IDS, HTTPStatus.BAD_REQUEST)
+    
+    body, status = execute_agent_command_raw('get_pipelines', pipeline_ids=ids)
+    return bytes_response(body, status)
 
-@app.route('/pipelines/<pipeline_id>', methods=['DELETE'])
-def delete_pipeline(pipeline_id):
-    """Delete a specific pipeline."""
-    response, status = execute_agent_command('delete_pipeline', pipeline_id=pipeline_id)
-    return jsonify(response), status
+def wait_for_run(run_id, timeout):
+    """Wait for a detached run to finish; 202 with the run ID if it is still going after timeout"""
+    deadline = time.monotonic() + timeout
+    checked_version = None
+    while True:
+        # Only ask the agent again once the stored state has actually changed
+        version = state_version()
+        if version != checked_version:
+            checked_version = version
+            response, status = execute_agent_command('get_run', run_id=run_id)
+            if status != HTTPStatus.OK or not response.get('success'):
+                return json_response(response, status)
+            run_status = response['data'].get('status')
+            if run_status not in ('pending', 'running'):
+                return json_response({'success': True, 'data': {
+                    'run_id': run_id, 'status': 'completed', 'run_status': run_status
+                }})
+        if time.monotonic() >= deadline:
+            return json_response({'success': True, 'data': {'run_id': run_id, 'status': 'running'}},
+                                 HTTPStatus.ACCEPTED)
+        time.sleep(SYNC_RUN_POLL_INTERVAL)
 
 @app.route('/pipelines/<pipeline_id>/run', methods=['POST'])
 def run_pipeline(pipeline_id):
-    """Run a specific pipeline."""
-    response, status = execute_agent_command('run_pipeline', pipeline_id=pipeline_id)
-    return jsonify(response), status
-
-@app.route('/pipelines/<pipeline_id>/cancel', methods=['POST'])
-def cancel_pipeline(pipeline_id):
-    """Cancel a running pipeline."""
-    response, status = execute_agent_command('cancel_pipeline', pipeline_id=pipeline_id)
-    return jsonify(response), status
+    """Start a pipeline run; with {"background": false} or ?background=false wait (bounded) for it to finish."""
+    options = request_json() or {}
+    if 'background' in options:
+        background = options['background']
+    else:
+        # The CLI sends the flag in the query string with an empty body
+        background = request.args.get('background', 'true').lower() not in ('false', '0')
+    # The run itself always executes detached, so a slow pipeline never outlives the agent call
+    body, status = execute_agent_command_raw('run_pipeline', pipeline_id=pipeline_id)
+    if status != HTTPStatus.OK or background:
+        return bytes_response(body, status)
+    
+    response = jsonutil.loads(body)
+    if not response.get('success'):
+        return bytes_response(body, status)
+    return wait_for_run(response['data']['run_id'], SYNC_RUN_TIMEOUT)
 
 @app.route('/pipelines/run', methods=['POST'])
 def create_and_run_pipeline():
     """Create and run a pipeline in one step."""
-    data = request.get_json()
+    data = request_json()
     if not data:
-        return jsonify({'error': 'No JSON data provided'}), HTTPStatus.BAD_REQUEST
-    
-    create_response, create_status = execute_agent_command('create_pipeline', pipeline_config=data)
-    if create_status != HTTPStatus.OK:
-        return jsonify(create_response), create_status
-    
-    pipeline_id = create_response.get('data', {}).get('pipeline_id')
-    if not pipeline_id:
-        return jsonify({'error': 'Failed to get pipeline ID from creation response'}), HTTPStatus.INTERNAL_SERVER_ERROR
+        return bytes_response(ERROR_NO_JSON, HTTPStatus.BAD_REQUEST)
+    # Reject malformed definitions here rather than after a round trip to the agent
+    error = pipeline_config_error(data)
+    if error:
+        return json_response({'error': error}, HTTPStatus.BAD_REQUEST)
     
-    run_response, run_status = execute_agent_command('run_pipeline', pipeline_id=pipeline_id)
-    return jsonify(run_response), run_status
+    # One agent call; the agent removes the pipeline again if its run cannot be started
+    body, status = execute_agent_command_raw('create_and_run_pipeline', pipeline_config=data)
+    return bytes_response(body, status)
 
 @app.route('/runs', methods=['GET'])
 def list_runs():
     """List all runs, optionally filtered by pipeline_id."""
     pipeline_id = request.args.get('pipeline_id')
     kwargs = {'pipeline_id': pipeline_id} if pipeline_id else {}
-    response, status = execute_agent_command('list_runs', **kwargs)
-    return jsonify(response), status
-
-@app.route('/runs/<run_id>', methods=['GET'])
-def get_run(run_id):
-    """Get a specific run."""
-    response, status = execute_agent_command('get_run', run_id=run_id)
-    return jsonify(response), status
-
-@app.route('/runs/<run_id>', methods=['DELETE'])
-def delete_run(run_id):
-    """Delete a specific run."""
-    response, status = execute_agent_command('delete_run', run_id=run_id)
-    return jsonify(response), status
-
-@app.route('/runs/<run_id>/cancel', methods=['POST'])
-def cancel_run(run_id):
-    """Cancel a specific run."""
-    response, status = execute_agent_command('cancel_run', run_id=run_id)
-    return jsonify(response), status
+    return cached_command_response(('runs', pipeline_id), 'list_runs', **kwargs)
+
+@app.route('/overview', methods=['GET'])
+def overview():
+    """List all pipelines and all runs in one response."""
+    return cached_command_response('overview', 'overview')
 
 @app.errorhandler(HTTPStatus.NOT_FOUND)
 def not_found(error):
     """Handle 404 errors."""
-    return jsonify({'error': 'Endpoint not found'}), HTTPStatus.NOT_FOUND
+    return bytes_response(ERROR_NOT_FOUND, HTTPStatus.NOT_FOUND)
+
+@app.errorhandler(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+def request_too_large(error):
+    """Handle 413 errors."""
+    return bytes_response(ERROR_TOO_LARGE, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
 
 @app.errorhandler(HTTPStatus.INTERNAL_SERVER_ERROR)
 def internal_error(error):
     """Handle 500 errors."""
-    logger.error(f"Internal server error: {error}")
-    return jsonify({'error': 'Internal server error'}), HTTPStatus.INTERNAL_SERVER_ERROR
+    logger.error("Internal server error: %s", error)
+    return bytes_response(ERROR_INTERNAL, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+@app.errorhandler(Exception)
+def unhandled_exception(error):
+    """Turn any exception escaping a view into the standard JSON 500 response."""
+    if isinstance(error, HTTPException):
+        # 405 and other HTTP errors without a dedicated handler keep their status and headers (e.g. Allow)
+        response = json_response({'error': error.name}, error.code)
+        for name, value in error.get_headers():
+            if name != 'Content-Type':
+                response.headers[name] = value
+        return response
+    logger.exception("Unhandled error in %s %s", request.method, request.path)
+    return bytes_response(ERROR_INTERNAL, HTTPStatus.INTERNAL_SERVER_ERROR)
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8000))
     debug = os.environ.get('DEBUG', 'false').lower() == 'true'
     
-    logger.info(f"Starting backend API on port {port}")
+    if not debug:
+        # The Werkzeug server handles one request at a time; hand over to gunicorn instead.
+        # DEBUG=true keeps the reloading development server
+        logger.info("Starting backend API under gunicorn on port %s", port)
+        os.execvp('gunicorn', ['gunicorn', '--chdir', BASE_DIR, '-c', os.path.join(BASE_DIR, 'gunicorn.conf.py'), 'backend_api:app'])
+    
+    logger.info("Starting backend API on port %s", port)
     app.run(host='0.0.0.0', port=port, debug=debug) 
@@ -0,0 +1,34 @@
+import { NextRequest } from 'next/server';
+
+const BACKEND_URL = process.env.BACKEND_URL || 'http://backend:8000';
+
+// Long-lived stream; never prerender or cache it
+export const dynamic = 'force-dynamic';
+
+export async function GET(request: NextRequest) {
+  try {
+    const response = await fetch(`${BACKEND_URL}/events`, {
+      method: 'GET',
+      headers: {
+        'Accept': 'text/event-stream',
+      },
+      // Close the backend stream when the browser goes away
+      signal: request.signal,
+    });
+
+    if (!response.ok || !response.body) {
+      throw new Error(`Backend responded with status: ${response.status}`);
+    }
+
+    return new Response(response.body, {
+      headers: {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'Connection': 'keep-alive',
+      },
+    });
+  } catch (error) {
+    console.error('Failed to open event stream:', error);
+    return new Response('Failed to open event stream', { status: 502 });
+  }
+}
@@ -1,4 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server';
+import { passThroughJson } from '@/lib/proxy';
 
 const BACKEND_URL = process.env.BACKEND_URL || 'http://backend:8000';
 
@@ -15,8 +16,7 @@ export async function GET() {
       throw new Error(`Backend responded with status: ${response.status}`);
     }
 
-    const data = await response.json();
-    return NextResponse.json(data);
+    return await passThroughJson(response);
   } catch (error) {
     console.error('Health check failed:', error);
     return NextResponse.json(
@@ -0,0 +1,36 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { passThroughJson } from '@/lib/proxy';
+
+const BACKEND_URL = process.env.BACKEND_URL || 'http://backend:8000';
+
+export async function GET(request: NextRequest) {
+  try {
+    const ifNoneMatch = request.headers.get('If-None-Match');
+    const response = await fetch(`${BACKEND_URL}/overview`, {
+      method: 'GET',
+      headers: {
+        'Content-Type': 'application/json',
+        ...(ifNoneMatch && { 'If-None-Match': ifNoneMatch }),
+      },
+    });
+
+    // Pass the backend's state-version ETag through, so browsers and the dashboard can skip unchanged data
+    const etag = response.headers.get('ETag');
+    const cacheHeaders = etag ? { 'ETag': etag, 'Cache-Control': 'no-cache' } : undefined;
+    if (response.status === 304) {
+      return new NextResponse(null, { status: 304, headers: cacheHeaders });
+    }
+
+    if (!response.ok) {
+      throw new Error(`Backend responded with status: ${response.status}`);
+    }
+
+    return await passThroughJson(response, cacheHeaders);
+  } catch (error) {
+    console.error('Failed to fetch overview:', error);
+    return NextResponse.json(
+      { error: 'Failed to fetch overview' },
+      { status: 500 }
+    );
+  }
+}
@@ -1,4 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server';
+import { passThroughJson } from '@/lib/proxy';
 
 const BACKEND_URL = process.env.BACKEND_URL || 'http://backend:8000';
 
@@ -19,8 +20,7 @@ export async function GET(
       throw new Error(errorData.error || `Backend responded with status: ${response.status}`);
     }
 
-    const data = await response.json();
-    return NextResponse.json(data);
+    return await passThroughJson(response);
   } catch (error) {
     console.error('Failed to get pipeline:', error);
     return NextResponse.json(
@@ -47,8 +47,7 @@ export async function DELETE(
       throw new Error(errorData.error || `Backend responded with status: ${response.status}`);
     }
 
-    const data = await response.json();
-    return NextResponse.json(data);
+    return await passThroughJson(response);
   } catch (error) {
     console.error('Failed to delete pipeline:', error);
     return NextResponse.json(
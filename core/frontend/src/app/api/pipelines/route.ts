@@ -1,4 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server';
+import { passThroughJson } from '@/lib/proxy';
 
 const BACKEND_URL = process.env.BACKEND_URL || 'http://backend:8000';
 
@@ -15,8 +16,7 @@ export async function GET() {
       throw new Error(`Backend responded with status: ${response.status}`);
     }
 
-    const data = await response.json();
-    return NextResponse.json(data);
+    return await passThroughJson(response);
   } catch (error) {
     console.error('Failed to fetch pipelines:', error);
     return NextResponse.json(
@@ -28,14 +28,15 @@ export async function GET() {
 
 export async function POST(request: NextRequest) {
   try {
-    const body = await request.json();
+    // Forward the body as-is; the backend parses and validates it
+    const body = await request.text();
     
     const response = await fetch(`${BACKEND_URL}/pipelines`, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
       },
-      body: JSON.stringify(body),
+      body,
     });
 
     if (!response.ok) {
@@ -43,8 +44,7 @@ export async function POST(request: NextRequest) {
       throw new Error(errorData.error || `Backend responded with status: ${response.status}`);
     }
 
-    const data = await response.json();
-    return NextResponse.json(data);
+    return await passThroughJson(response);
   } catch (error) {
     console.error('Failed to create pipeline:', error);
     return NextResponse.json(
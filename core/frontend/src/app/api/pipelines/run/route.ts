@@ -1,17 +1,19 @@
 import { NextRequest, NextResponse } from 'next/server';
+import { passThroughJson } from '@/lib/proxy';
 
 const BACKEND_URL = process.env.BACKEND_URL || 'http://backend:8000';
 
 export async function POST(request: NextRequest) {
   try {
-    const body = await request.json();
+    // Forward the body as-is; the backend parses and validates it
+    const body = await request.text();
     
     const response = await fetch(`${BACKEND_URL}/pipelines/run`, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
       },
-      body: JSON.stringify(body),
+      body,
     });
 
     if (!response.ok) {
@@ -19,8 +21,7 @@ export async function POST(request: NextRequest) {
       throw new Error(errorData.error || `Backend responded with status: ${response.status}`);
     }
 
-    const data = await response.json();
-    return NextResponse.json(data);
+    return await passThroughJson(response);
   } catch (error) {
     console.error('Failed to create and run pipeline:', error);
     return NextResponse.json(
@@ -1,6 +1,6 @@
 'use client';
 
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { useRouter } from 'next/navigation';
 import { 
   RocketLaunchIcon, 
@@ -14,7 +14,7 @@ import {
   EyeIcon
 } from '@heroicons/react/24/outline';
 
-import { Pipeline, PipelineRun, CreatePipelineRequest } from '@/types/api';
+import { Pipeline, PipelineRun, CreatePipelineRequest, ApiResponse, OverviewResponse } from '@/types/api';
 import { apiClient } from '@/lib/api';
 import { formatDate, formatDuration, formatRelativeTime, defaultPipelineTemplate } from '@/lib/utils';
 import { StatusBadge } from '@/components/ui/status-badge';
@@ -30,6 +30,8 @@ export default function Dashboard() {
   const [pipelinePage, setPipelinePage] = useState(1);
   const [runsPage, setRunsPage] = useState(1);
   const router = useRouter();
+  // ETag of the overview currently on screen; an identical response needs no re-render
+  const overviewEtag = useRef<string | null>(null);
   
   const { logs, addLog, clearLogs } = useLogs();
   
@@ -47,30 +49,57 @@ export default function Dashboard() {
     runsPage * ITEMS_PER_PAGE
   );
 
-  // Auto-refresh every 5 seconds
+  // Reload whenever the backend reports a state change; poll only while the event stream is down
   useEffect(() => {
-    const interval = setInterval(() => {
-      loadData();
-    }, 5000);
+    let interval: ReturnType<typeof setInterval> | null = null;
+    const startPolling = () => {
+      if (!interval) interval = setInterval(loadData, 5000);
+    };
+    const stopPolling = () => {
+      if (interval) clearInterval(interval);
+      interval = null;
+    };
 
     // Load initial data
     loadData();
 
-    return () => clearInterval(interval);
+    if (typeof EventSource === 'undefined') {
+      startPolling();
+      return stopPolling;
+    }
+
+    const events = new EventSource('/api/events');
+    events.onopen = stopPolling;
+    events.onmessage = () => loadData();
+    events.onerror = startPolling;
+
+    return () => {
+      events.close();
+      stopPolling();
+    };
   }, []);
 
   const loadData = async () => {
     try {
-      const [pipelinesData, runsData] = await Promise.all([
-        apiClient.listPipelines(),
-        apiClient.listRuns()
-      ]);
+      // One request for both lists instead of two
+      const response = await fetch('/api/overview');
+      const etag = response.headers.get('ETag');
+      if (response.ok && etag && etag === overviewEtag.current) {
+        return;
+      }
+      const body: ApiResponse<OverviewResponse> & { success?: boolean } = await response.json();
+      if (!response.ok || body.success === false || !body.data) {
+        throw new Error(body.error || `Backend responded with status: ${response.status}`);
+      }
+      const { pipelines: pipelinesData, runs: runsData } = body.data;
       
       // Ensure we have arrays
       setPipelines(Array.isArray(pipelinesData) ? pipelinesData : []);
       setRuns(Array.isArray(runsData) ? runsData : []);
       setError(null); // Clear any previous errors
+      overviewEtag.current = etag;
     } catch (err) {
+      overviewEtag.current = null;
       const message = err instanceof Error ? err.message : 'Failed to load data';
       setError(message);
       addLog(`❌ Error loading data: ${message}`, 'error');
@@ -1,14 +1,49 @@
 'use client';
 
-import { useEffect, useRef, useState } from 'react';
+import { memo, useCallback, useEffect, useRef, useState } from 'react';
 import { cn } from '@/lib/utils';
 
 interface LogEntry {
+  id?: number;
   timestamp: string;
   message: string;
   level?: 'info' | 'error' | 'warning' | 'success';
 }
 
+// Oldest entries are dropped beyond this many
+const MAX_LOGS = 100;
+let nextLogId = 0;
+
+const getLevelColor = (level?: string) => {
+  switch (level) {
+    case 'error':
+      return 'text-red-400';
+    case 'warning':
+      return 'text-yellow-400';
+    case 'success':
+      return 'text-green-400';
+    default:
+      return 'text-green-300';
+  }
+};
+
+// Entries never change once added, so a line only renders when it is first appended
+const LogLine = memo(function LogLine({ log }: { log: LogEntry }) {
+  return (
+    <div 
+      className={cn(
+        'whitespace-pre-wrap break-words',
+        getLevelColor(log.level)
+      )}
+    >
+      <span className="text-gray-400 text-xs">
+        [{log.timestamp}]
+      </span>{' '}
+      {log.message}
+    </div>
+  );
+});
+
 interface LogViewerProps {
   logs: LogEntry[];
   className?: string;
@@ -37,19 +72,6 @@ export function LogViewer({
     setIsUserScrolling(!isAtBottom);
   };
 
-  const getLevelColor = (level?: string) => {
-    switch (level) {
-      case 'error':
-        return 'text-red-400';
-      case 'warning':
-        return 'text-yellow-400';
-      case 'success':
-        return 'text-green-400';
-      default:
-        return 'text-green-300';
-    }
-  };
-
   return (
     <div 
       className={cn(
@@ -67,19 +89,9 @@ export function LogViewer({
         {logs.length === 0 ? (
           <div className="text-gray-500">No logs available...</div>
         ) : (
+          // Stable keys: when the oldest line is dropped, the other lines keep their DOM nodes
           logs.map((log, index) => (
-            <div 
-              key={index} 
-              className={cn(
-                'whitespace-pre-wrap break-words',
-                getLevelColor(log.level)
-              )}
-            >
-              <span className="text-gray-400 text-xs">
-                [{log.timestamp}]
-              </span>{' '}
-              {log.message}
-            </div>
+            <LogLine key={log.id ?? `i${index}`} log={log} />
           ))
         )}
         <div ref={logEndRef} />
@@ -106,18 +118,19 @@ export function LogViewer({
 export function useLogs() {
   const [logs, setLogs] = useState<LogEntry[]>([]);
 
-  const addLog = (message: string, level?: LogEntry['level']) => {
-    const timestamp = new Date().toISOString();
+  const addLog = useCallback((message: string, level?: LogEntry['level']) => {
+    const entry = { id: nextLogId++, timestamp: new Date().toISOString(), message, level };
     setLogs(prev => {
-      const newLogs = [...prev, { timestamp, message, level }];
-      // Keep only last 100 logs to prevent memory issues
-      return newLogs.slice(-100);
+      // Keep only the last MAX_LOGS logs to prevent memory issues, copying the array once
+      const newLogs = prev.length >= MAX_LOGS ? prev.slice(prev.length - MAX_LOGS + 1) : prev.slice();
+      newLogs.push(entry);
+      return newLogs;
     });
-  };
+  }, []);
 
-  const clearLogs = () => {
+  const clearLogs = useCallback(() => {
     setLogs([]);
-  };
+  }, []);
 
   return { logs, addLog, clearLogs };
 } 
@@ -0,0 +1,9 @@
+import { NextResponse } from 'next/server';
+
+// Pass the backend's JSON through as bytes instead of parsing and re-serializing it
+export async function passThroughJson(response: Response, headers?: Record<string, string>) {
+  return new NextResponse(await response.arrayBuffer(), {
+    status: response.status,
+    headers: { 'Content-Type': 'application/json', ...headers },
+  });
+}
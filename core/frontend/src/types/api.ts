@@ -53,6 +53,11 @@ export interface ApiResponse<T = any> {
   error?: string;
 }
 
+export interface OverviewResponse {
+  pipelines: Pipeline[];
+  runs: PipelineRun[];
+}
+
 export interface CreatePipelineResponse {
   pipeline_id: string;
   status: string;
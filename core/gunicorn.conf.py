@@ -0,0 +1,26 @@
+"""
+Gunicorn settings for the backend API.
+Every value can be overridden through the environment (WORKERS, THREADS, TIMEOUT, PORT).
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+# Requests mostly wait on agent subprocesses, so threaded workers keep the cores busy
+worker_class = 'gthread'
+workers = int(os.environ.get('WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('THREADS', 8))
+
+# Longer than the agent timeout, so a slow agent command is reported instead of killing the worker
+timeout = int(os.environ.get('TIMEOUT', 60))
+
+# Keep idle connections (nginx upstream pool, polling clients) open between requests
+keepalive = int(os.environ.get('KEEPALIVE', 30))
+
+# Import the app once in the master; workers share it copy-on-write
+preload_app = True
+
+# Heartbeat files on tmpfs, so a slow disk cannot make workers look hung
+worker_tmp_dir = '/dev/shm'
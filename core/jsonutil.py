@@ -0,0 +1,44 @@
+"""
+JSON helpers shared by the agent, its command-line interface and the HTTP API.
+Uses orjson when it is installed and falls back to the standard json module.
+"""
+
+import json
+from typing import Any
+try:
+    import orjson  # C implementation, much faster than the json module
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+_decoder = json.JSONDecoder()
+
+def _default(obj: Any) -> Any:
+    """Fallback encoder for the stdlib json path (orjson handles these natively)"""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when available"""
+    if HAS_ORJSON:
+        # Dataclasses and enums are encoded in C without building intermediate dicts
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':'), default=_default).encode()
+
+def loads(data) -> Any:
+    """Parse JSON from bytes or str, using orjson when available; raises ValueError"""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def loads_first_object(text: str) -> Any:
+    """Parse the first JSON object in text that may have other output around it; raises ValueError"""
+    # raw_decode runs in C and, unlike brace counting, copes with braces inside strings
+    start = text.find('{')
+    while start != -1:
+        try:
+            return _decoder.raw_decode(text, start)[0]
+        except ValueError:
+            start = text.find('{', start + 1)
+    raise ValueError("No JSON object found")
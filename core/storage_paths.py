@@ -0,0 +1,27 @@
+"""
+Locations of the agent's persisted state, shared by the agent and the HTTP API.
+Nothing here imports the agent, so the API can watch the files without loading it.
+"""
+
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def default_data_file() -> str:
+    """Snapshot file used when CICDAgent is not given one"""
+    if os.path.exists('/app'):
+        return '/app/data/agent_data.pkl'
+    # For local development
+    return os.path.join(BASE_DIR, 'data', 'agent_data.pkl')
+
+def log_file(data_file: str) -> str:
+    """Append-only event log kept next to a snapshot file"""
+    return os.path.splitext(data_file)[0] + '.events'
+
+def lock_file(data_file: str) -> str:
+    """Lock file guarding a snapshot file and its event log"""
+    return os.path.splitext(data_file)[0] + '.lock'
+
+def state_files(data_file: str) -> tuple:
+    """Files every state change touches: the snapshot and its event log"""
+    return (data_file, log_file(data_file))
@@ -0,0 +1,119 @@
+import os
+import pickle
+
+import pytest
+
+import agent
+import jsonutil
+from agent import CICDAgent, PipelineStatus
+
+PIPELINE = {'name': 'build', 'steps': [{'name': 'hello', 'command': 'echo hello'}]}
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    return str(tmp_path / 'agent_data.pkl')
+
+
+def test_instances_see_each_others_changes_on_refresh(data_file):
+    first = CICDAgent(data_file=data_file)
+    second = CICDAgent(data_file=data_file)
+
+    pipeline_id = first.create_pipeline(PIPELINE)
+    run_id = first.create_run(pipeline_id)
+    assert pipeline_id not in second.pipelines
+
+    second.refresh()
+    assert second.pipelines[pipeline_id]['name'] == 'build'
+    assert run_id in second.runs
+
+    second.cancel_run(run_id)
+    second.delete_pipeline(pipeline_id)
+    first.refresh()
+    assert first.runs[run_id].status == PipelineStatus.CANCELLED
+    assert pipeline_id not in first.pipelines
+
+
+def test_refresh_skips_own_events(data_file):
+    instance = CICDAgent(data_file=data_file)
+    pipeline_id = instance.create_pipeline(PIPELINE)
+    instance.create_run(pipeline_id)
+
+    instance.refresh()
+    assert len(instance.runs) == 1
+    assert len(instance._runs_by_pipeline[pipeline_id]) == 1
+
+
+def test_log_is_compacted_after_compact_every_events(data_file, monkeypatch):
+    monkeypatch.setattr(agent, 'COMPACT_EVERY', 5)
+    instance = CICDAgent(data_file=data_file)
+
+    pipeline_ids = [instance.create_pipeline(PIPELINE) for _ in range(4)]
+    instance._flush()
+    assert not os.path.exists(data_file)
+
+    pipeline_ids.append(instance.create_pipeline(PIPELINE))
+    instance._flush()
+    assert os.path.exists(data_file)
+    assert not os.path.exists(instance.log_file)
+
+    reloaded = CICDAgent(data_file=data_file)
+    assert sorted(reloaded.pipelines) == sorted(pipeline_ids)
+
+
+def test_torn_trailing_line_is_left_for_the_next_read(data_file):
+    instance = CICDAgent(data_file=data_file)
+    pipeline = dict(PIPELINE, id='p-1', variables={})
+    line = jsonutil.dumps({'type': 'pipeline_created', 'pipeline': pipeline, 'writer': 'other'}) + b'\n'
+
+    with open(instance.log_file, 'ab') as f:
+        f.write(line[:10])
+    instance.refresh()
+    assert 'p-1' not in instance.pipelines
+    assert instance._log_offset == 0
+
+    with open(instance.log_file, 'ab') as f:
+        f.write(line[10:])
+    instance.refresh()
+    assert instance.pipelines['p-1']['name'] == 'build'
+    assert instance._log_offset == len(line)
+
+
+def test_snapshot_compacted_by_another_instance_is_reloaded(data_file):
+    first = CICDAgent(data_file=data_file)
+    second = CICDAgent(data_file=data_file)
+
+    compacted_id = second.create_pipeline(PIPELINE)
+    second._save_data()
+    appended_id = second.create_pipeline(PIPELINE)
+
+    first.refresh()
+    assert compacted_id in first.pipelines
+    assert appended_id in first.pipelines
+
+
+def test_unreadable_snapshot_is_moved_aside(data_file):
+    with open(data_file, 'wb') as f:
+        f.write(b'not a pickle')
+
+    instance = CICDAgent(data_file=data_file)
+    assert instance.pipelines == {}
+    assert os.path.exists(data_file + '.backup')
+
+
+def test_list_shaped_run_history_loads(data_file):
+    history = [{'id': 'r-1', 'pipeline_id': 'p-1', 'status': PipelineStatus.SUCCESS,
+                'created_at': '2024-01-01T00:00:00'}]
+    with open(data_file, 'wb') as f:
+        pickle.dump({'pipelines': {}, 'runs': {}, 'run_history': history}, f)
+
+    instance = CICDAgent(data_file=data_file)
+    assert instance.run_history['r-1']['status'] == 'success'
+    assert instance._history_by_pipeline == {'p-1': ['r-1']}
+
+
+def test_history_status_is_stored_as_string(data_file):
+    instance = CICDAgent(data_file=data_file)
+    instance._add_history_run({'id': 'r-1', 'pipeline_id': 'p-1', 'status': PipelineStatus.FAILED,
+                               'created_at': '2024-01-01T00:00:00'})
+    assert instance.run_history['r-1']['status'] == 'failed'
@@ -0,0 +1,53 @@
+import pytest
+
+import agent_interface
+from agent import CICDAgent
+
+
+@pytest.fixture
+def instance(tmp_path):
+    return CICDAgent(data_file=str(tmp_path / 'agent_data.pkl'))
+
+
+def pipeline(variables):
+    return {'name': 'vars', 'variables': variables, 'steps': [{'name': 'env', 'command': 'printenv GREETING'}]}
+
+
+def test_identifier_names_are_accepted_and_exported(instance):
+    pipeline_id = instance.create_pipeline(pipeline({'GREETING': 'hi', '_build_2': 3}))
+    run_id = instance.run_pipeline(pipeline_id, background=False)
+    assert instance.run_history[run_id]['steps'][0]['output'] == 'hi\n'
+
+
+@pytest.mark.parametrize('name', ['1A', 'A=B', 'MY-VAR', 'A B', ''])
+def test_non_identifier_names_are_rejected(instance, name):
+    with pytest.raises(ValueError, match='Invalid variable name'):
+        instance.create_pipeline(pipeline({name: 'x'}))
+    assert instance.pipelines == {}
+
+
+@pytest.mark.parametrize('name', ['PATH', 'HOME', 'IFS', 'BASH_ENV', 'LD_PRELOAD', 'DYLD_LIBRARY_PATH', 'BASH_FUNC_x%%'])
+def test_reserved_names_are_rejected(instance, name):
+    with pytest.raises(ValueError):
+        instance.create_pipeline(pipeline({name: 'x'}))
+    assert instance.pipelines == {}
+
+
+def test_nul_in_value_is_rejected(instance):
+    with pytest.raises(ValueError, match='NUL'):
+        instance.create_pipeline(pipeline({'GREETING': 'a\0b'}))
+
+
+def test_rejection_is_reported_by_the_command_interface(instance, monkeypatch):
+    monkeypatch.setattr(agent_interface, 'get_agent', lambda: instance)
+    result = agent_interface.handle_command('create_pipeline', {'pipeline_config': pipeline({'PATH': '/tmp'})})
+    assert result == {'success': False, 'error': "Variable name 'PATH' is reserved"}
+
+
+def test_stored_pipeline_with_reserved_name_runs_without_exporting(instance):
+    # Definitions saved before the check was added bypass create_pipeline
+    instance.pipelines['old'] = dict(pipeline({'PATH': '/nowhere', 'GREETING': 'hi'}), id='old')
+    run_id = instance.create_run('old')
+    assert not instance._execute_run(run_id)
+    # GREETING was not exported either, so printenv finds nothing
+    assert instance.run_history[run_id]['status'] == 'failed'
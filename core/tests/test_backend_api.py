@@ -0,0 +1,150 @@
+import functools
+from collections import OrderedDict
+from http import HTTPStatus
+
+import pytest
+
+import agent_interface
+import backend_api
+import jsonutil
+import storage_paths
+from agent import CICDAgent
+
+PIPELINE = {'name': 'build', 'steps': [{'name': 'hello', 'command': 'echo hello'}]}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Test client with the agent call and the run wait recorded instead of executed"""
+    calls = {'waited': []}
+
+    def fake_command_raw(command, **kwargs):
+        return jsonutil.dumps({'success': True, 'data': {'run_id': 'run-1'}}), HTTPStatus.OK
+
+    def fake_wait_for_run(run_id, timeout):
+        calls['waited'].append(run_id)
+        return backend_api.json_response({'run_id': run_id, 'status': 'completed'}, HTTPStatus.OK)
+
+    monkeypatch.setattr(backend_api, 'execute_agent_command_raw', fake_command_raw)
+    monkeypatch.setattr(backend_api, 'wait_for_run', fake_wait_for_run)
+    with backend_api.app.test_client() as test_client:
+        yield test_client, calls
+
+
+def test_run_pipeline_background_false_in_query_waits(client):
+    test_client, calls = client
+    # Same shape as the CLI's `pipeline run --background=false`: flag in the query string, no body
+    response = test_client.post('/pipelines/p-1/run?background=false')
+    assert response.status_code == HTTPStatus.OK
+    assert response.get_json()['status'] == 'completed'
+    assert calls['waited'] == ['run-1']
+
+
+def test_run_pipeline_background_false_in_body_waits(client):
+    test_client, calls = client
+    response = test_client.post('/pipelines/p-1/run', json={'background': False})
+    assert response.status_code == HTTPStatus.OK
+    assert calls['waited'] == ['run-1']
+
+
+def test_run_pipeline_defaults_to_background(client):
+    test_client, calls = client
+    response = test_client.post('/pipelines/p-1/run?background=true')
+    assert response.status_code == HTTPStatus.OK
+    assert response.get_json()['data']['run_id'] == 'run-1'
+    assert calls['waited'] == []
+
+
+def test_state_files_match_the_default_agent():
+    # state_version() watches these; a mismatch would leave caches and /events stale
+    import agent
+    assert backend_api.STATE_FILES == (agent.agent.data_file, agent.agent.log_file)
+
+
+@pytest.fixture
+def agent_client(tmp_path, monkeypatch):
+    """Test client backed by a real in-process agent storing its state under tmp_path"""
+    instance = CICDAgent(data_file=str(tmp_path / 'agent_data.pkl'))
+    monkeypatch.setattr(backend_api, 'AGENT_TRANSPORT', 'inprocess')
+    monkeypatch.setattr(agent_interface, 'get_agent', functools.lru_cache(maxsize=1)(lambda: instance))
+    monkeypatch.setattr(backend_api, 'STATE_FILES', storage_paths.state_files(instance.data_file))
+    monkeypatch.setattr(backend_api, '_response_cache', OrderedDict())
+    with backend_api.app.test_client() as test_client:
+        yield test_client, instance
+
+
+def test_batch_returns_details_in_order_with_null_for_missing(agent_client):
+    test_client, instance = agent_client
+    first = instance.create_pipeline(PIPELINE)
+    second = instance.create_pipeline(dict(PIPELINE, name='deploy'))
+
+    response = test_client.post('/pipelines/batch', json={'ids': [second, 'missing', first]})
+    assert response.status_code == HTTPStatus.OK
+    data = response.get_json()['data']
+    assert [pipeline and pipeline['name'] for pipeline in data] == ['deploy', None, 'build']
+
+
+@pytest.mark.parametrize('body', [{'ids': 'p-1'}, {'ids': ['p-1', 2]}, {'id': ['p-1']}, ['p-1']])
+def test_batch_rejects_invalid_ids(agent_client, body):
+    test_client, _ = agent_client
+    response = test_client.post('/pipelines/batch', json=body)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.get_json() == {'error': "'ids' must be a list of pipeline IDs"}
+
+
+def test_batch_requires_a_body(agent_client):
+    test_client, _ = agent_client
+    response = test_client.post('/pipelines/batch')
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.parametrize('config, error', [
+    ({'name': '', 'steps': []}, "Pipeline 'name' must be a non-empty string"),
+    ({'steps': []}, "Pipeline 'name' must be a non-empty string"),
+    ({'name': 'build', 'steps': 'echo hi'}, "Pipeline 'steps' must be a list of objects"),
+    ({'name': 'build', 'steps': ['echo hi']}, "Pipeline 'steps' must be a list of objects"),
+])
+def test_invalid_pipeline_definitions_are_rejected(agent_client, config, error):
+    test_client, instance = agent_client
+    for path in ('/pipelines', '/pipelines/run'):
+        response = test_client.post(path, json=config)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.get_json() == {'error': error}
+    assert instance.pipelines == {}
+
+
+def test_valid_pipeline_definition_is_created(agent_client):
+    test_client, instance = agent_client
+    response = test_client.post('/pipelines', json=PIPELINE)
+    assert response.status_code == HTTPStatus.OK
+    assert response.get_json()['data']['pipeline_id'] in instance.pipelines
+
+
+def test_get_answers_304_until_the_state_changes(agent_client):
+    test_client, instance = agent_client
+    pipeline_id = instance.create_pipeline(PIPELINE)
+
+    response = test_client.get(f'/pipelines/{pipeline_id}')
+    assert response.status_code == HTTPStatus.OK
+    etag = response.headers['ETag']
+
+    response = test_client.get(f'/pipelines/{pipeline_id}', headers={'If-None-Match': etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    # The gateway's gzip weakens the tag on the way back
+    response = test_client.get(f'/pipelines/{pipeline_id}', headers={'If-None-Match': 'W/' + etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    instance.create_pipeline(dict(PIPELINE, name='deploy'))
+    response = test_client.get(f'/pipelines/{pipeline_id}', headers={'If-None-Match': etag})
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['ETag'] != etag
+    assert response.get_json()['data']['name'] == 'build'
+
+
+def test_cached_list_is_refreshed_after_a_change(agent_client):
+    test_client, instance = agent_client
+    instance.create_pipeline(PIPELINE)
+    assert len(test_client.get('/pipelines').get_json()['data']) == 1
+
+    instance.create_pipeline(dict(PIPELINE, name='deploy'))
+    assert len(test_client.get('/pipelines').get_json()['data']) == 2